@@ -0,0 +1,242 @@
+# backtest.py - Event-driven backtester with a simulated TradingEngine
+#
+# Usage: python backtest.py --tokens WETH WBTC [--chain eth] [--sweep]
+import argparse
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+from risk_management import RiskManager
+from strategies.stat_arb import StatisticalArbitrageStrategy, make_labels
+from token_registry import registry
+from trade_ledger import TradeLedger
+
+DEFAULT_PARAMS = {
+    "train_frac": 0.5,        # First part of history trains the model
+    "horizon": 5,             # Bars ahead used to label up/down moves
+    "threshold": 0.6,         # Ensemble confidence needed to act
+    "fee_bps": 10,
+    "slippage_bps": 5,
+    "initial_capital": 10000,
+    "bars_per_day": 288,      # 5-minute bars
+    "quote": "USDC"
+}
+
+
+class FeeModel:
+    def __init__(self, fee_bps: float = 10, slippage_bps: float = 5):
+        """Proportional fee on notional plus a fixed adverse slippage"""
+        self.fee = fee_bps / 10000
+        self.slippage = slippage_bps / 10000
+        
+    def fill_price(self, price: float, buying: bool) -> float:
+        return price * (1 + self.slippage) if buying else price * (1 - self.slippage)
+
+
+class SimulatedTradingEngine:
+    def __init__(self, start_balances: Optional[Dict[str, float]] = None,
+                 fee_model: Optional[FeeModel] = None, quote: str = "USDC"):
+        """Drop-in for TradingEngine: same execute_trade / get_portfolio, no network"""
+        self.balances = dict(start_balances or {quote: 10000})
+        self.fee_model = fee_model or FeeModel()
+        self.quote = quote
+        self.prices = {quote: 1.0}
+        self.now = None
+        
+        self.ledger = TradeLedger(log_dir=None, start_balance=self.portfolio_value())
+        
+    def set_market(self, prices: Dict[str, float], now=None):
+        """Advance the simulated clock to the next bar"""
+        self.prices.update(prices)
+        self.now = now
+        
+    def portfolio_value(self) -> float:
+        return sum(amount * self.prices.get(token, 0) for token, amount in self.balances.items())
+    
+    def execute_trade(self, from_token: str, to_token: str, amount: str, reason: str,
+                      chain: str = "eth") -> Dict:
+        """Swap `amount` of from_token into to_token at the current bar's price (single venue; chain is ignored)"""
+        # Accept addresses too, so the simulator takes what TradingEngine sends
+        from_token = registry.symbol(from_token)
+        to_token = registry.symbol(to_token)
+        amount = float(amount)
+        
+        if from_token not in self.prices or to_token not in self.prices:
+            return {"success": False, "error": f"no price for {from_token}/{to_token}", "status": 400}
+        if amount <= 0 or self.balances.get(from_token, 0) < amount - 1e-12:
+            return {"success": False, "error": "insufficient balance", "status": 400}
+        
+        # Slippage moves the price against us on the non-quote leg
+        from_price = self.fee_model.fill_price(self.prices[from_token], buying=False) \
+            if from_token != self.quote else 1.0
+        to_price = self.fee_model.fill_price(self.prices[to_token], buying=True) \
+            if to_token != self.quote else 1.0
+        
+        value = amount * from_price
+        fee = value * self.fee_model.fee
+        received = (value - fee) / to_price
+        
+        self.balances[from_token] = self.balances.get(from_token, 0) - amount
+        self.balances[to_token] = self.balances.get(to_token, 0) + received
+        
+        result = {
+            "transaction": {
+                "fromToken": from_token,
+                "toToken": to_token,
+                "fromAmount": amount,
+                "toAmount": received,
+                "price": from_price / to_price,
+                "tradeAmountUsd": value,
+                "fee": fee,
+                "timestamp": str(self.now)
+            }
+        }
+        self.ledger.record(from_token, to_token, amount, reason, raw=result)
+        return {"success": True, "data": result}
+    
+    def get_portfolio(self) -> Dict:
+        portfolio = {token: amount for token, amount in self.balances.items()}
+        portfolio["totalValue"] = self.portfolio_value()
+        return portfolio
+
+
+def compute_stats(equity: np.ndarray, trade_pnls: List[float], periods_per_year: float) -> Dict:
+    """The metrics the dashboard shows, from an equity curve and closed-trade PnLs"""
+    returns = np.diff(equity) / equity[:-1] if len(equity) > 1 else np.zeros(0)
+    std = returns.std(ddof=1) if len(returns) > 1 else 0
+    peaks = np.maximum.accumulate(equity) if len(equity) else equity
+    drawdowns = 1 - equity / peaks if len(equity) else np.zeros(0)
+    
+    return {
+        "total_return": round(float(equity[-1] / equity[0] - 1) * 100, 4) if len(equity) else 0,
+        "sharpe_ratio": round(float(returns.mean() / std * math.sqrt(periods_per_year)), 4) if std > 0 else 0,
+        "max_drawdown": round(float(drawdowns.max()) * 100, 4) if len(drawdowns) else 0,
+        "winning_trades": int(sum(1 for pnl in trade_pnls if pnl > 0)),
+        "total_trades": len(trade_pnls)
+    }
+
+
+def run_backtest(price_data: pd.DataFrame, params: Optional[Dict] = None) -> Dict:
+    """Train on the start of `price_data` (two token columns), replay the rest.
+    
+    Features, labels and model signals are computed in batch up front;
+    the bar-by-bar loop only handles risk checks and simulated fills.
+    The first column is the traded token, priced in the quote token.
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    token = price_data.columns[0]
+    quote = params["quote"]
+    
+    # Vectorized part: features, labels, one batched inference pass
+    strategy = StatisticalArbitrageStrategy()
+    features = strategy.calculate_spread_features(price_data)
+    labels = make_labels(price_data[token], params["horizon"]).loc[features.index]
+    
+    split = int(len(features) * params["train_frac"])
+    train_end = split - params["horizon"]  # Labels must not look into the test period
+    if train_end <= 0 or split >= len(features):
+        raise ValueError("Not enough history to split into train and test periods")
+    strategy.train_ml_model(features.iloc[:train_end], labels.iloc[:train_end])
+    
+    test = features.iloc[split:]
+    signals = strategy.generate_signals_batch(test, threshold=params["threshold"])
+    volatility = price_data[token].pct_change().rolling(20).std().loc[test.index].fillna(0).to_numpy()
+    prices = price_data[token].loc[test.index].to_numpy()
+    
+    # Event loop: RiskManager and the simulated engine see one bar at a time
+    engine = SimulatedTradingEngine(
+        {quote: params["initial_capital"]},
+        FeeModel(params["fee_bps"], params["slippage_bps"]),
+        quote
+    )
+    risk = RiskManager(initial_capital=params["initial_capital"])
+    
+    equity = np.empty(len(test))
+    trade_pnls = []
+    entry_cost = 0.0
+    day_start_equity = params["initial_capital"]
+    
+    for i, (now, signal) in enumerate(zip(test.index, signals)):
+        engine.set_market({token: prices[i]}, now)
+        value = engine.portfolio_value()
+        risk.current_capital = value
+        if i % params["bars_per_day"] == 0:
+            day_start_equity = value
+        
+        holding = engine.balances.get(token, 0)
+        checks = risk.check_risk_limits(value - day_start_equity)
+        
+        if holding > 0 and (signal["action"] == "sell" or not all(checks.values())):
+            result = engine.execute_trade(token, quote, str(holding), "exit")
+            if result["success"]:
+                trade_pnls.append(result["data"]["transaction"]["toAmount"] - entry_cost)
+        elif holding == 0 and signal["action"] == "buy" and all(checks.values()):
+            size = risk.calculate_position_size(signal["confidence"], volatility[i])
+            result = engine.execute_trade(quote, token, str(size), "entry")
+            if result["success"]:
+                entry_cost = size
+        
+        equity[i] = engine.portfolio_value()
+    
+    # Count a position still open at the end as closed at the last price
+    if engine.balances.get(token, 0) > 0:
+        trade_pnls.append(engine.balances[token] * prices[-1] - entry_cost)
+    
+    return compute_stats(equity, trade_pnls, params["bars_per_day"] * 365)
+
+
+def _run_one(args: Tuple[pd.DataFrame, Dict]) -> Tuple[Dict, Dict]:
+    price_data, params = args
+    return params, run_backtest(price_data, params)
+
+
+def sweep(price_data: pd.DataFrame, grid: Dict[str, List], processes: Optional[int] = None) -> List[Tuple[Dict, Dict]]:
+    """Run every parameter combination of `grid` in parallel worker processes.
+    
+    Returns (params, stats) pairs sorted by Sharpe ratio, best first.
+    """
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        results = list(executor.map(_run_one, [(price_data, params) for params in combos]))
+    return sorted(results, key=lambda r: r[1]["sharpe_ratio"], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest StatisticalArbitrageStrategy on stored bars")
+    parser.add_argument("--tokens", nargs=2, default=["WETH", "WBTC"], help="traded token, paired token")
+    parser.add_argument("--chain", default="eth")
+    parser.add_argument("--start", help="ISO date, e.g. 2025-07-01")
+    parser.add_argument("--end", help="ISO date")
+    parser.add_argument("--sweep", action="store_true", help="sweep threshold/horizon/fees")
+    parser.add_argument("--processes", type=int)
+    args = parser.parse_args()
+    
+    from bar_store import BarStore
+    to_ms = lambda s: int(datetime.fromisoformat(s).timestamp() * 1000) if s else None
+    price_data = BarStore().price_frame(args.tokens, args.chain, to_ms(args.start), to_ms(args.end)).dropna()
+    if len(price_data) == 0:
+        print(f"❌ No stored bars for {args.tokens} on {args.chain}")
+        return
+    
+    if not args.sweep:
+        print(run_backtest(price_data))
+        return
+    
+    grid = {
+        "threshold": [0.55, 0.6, 0.7, 0.8],
+        "horizon": [3, 5, 10],
+        "fee_bps": [5, 10]
+    }
+    for params, stats in sweep(price_data, grid, args.processes)[:10]:
+        print(params, stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# bar_store.py - Append-only columnar price history, memory-mapped for zero-copy reads
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+import config
+
+# One raw little-endian file per column; row i of every file is bar i
+COLUMNS = {
+    "ts": np.dtype("<i8"),       # Bar open time, unix milliseconds
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8")
+}
+VALUE_COLUMNS = [name for name in COLUMNS if name != "ts"]
+
+
+class BarSeries:
+    def __init__(self, path: str):
+        """Bars for one (chain, token), stored as fixed-width column files.
+        
+        Appends write the value columns first and `ts` last, so the length
+        of ts.col is the committed row count. Readers never see half a bar.
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._maps = {}
+        self._mapped_rows = 0
+        self._repair()
+        
+    def _file(self, column: str) -> str:
+        return os.path.join(self.path, f"{column}.col")
+    
+    def _repair(self):
+        """Drop a torn ts tail and value rows past the last committed ts (crash mid-append)"""
+        self._truncate(len(self))
+        
+    def _truncate(self, rows: int):
+        """Cut every column, ts included, to exactly `rows` rows"""
+        for column, dtype in COLUMNS.items():
+            path = self._file(column)
+            size = rows * dtype.itemsize
+            if not os.path.exists(path) or os.path.getsize(path) != size:
+                with open(path, "ab") as f:
+                    f.truncate(size)
+    
+    def __len__(self) -> int:
+        try:
+            return os.path.getsize(self._file("ts")) // COLUMNS["ts"].itemsize
+        except OSError:
+            return 0
+    
+    def append(self, ts, open=None, high=None, low=None, close=None, volume=0.0):
+        """Append one or many bars (scalars or equal-length arrays).
+        
+        Timestamps must be strictly increasing. open/high/low default to close.
+        """
+        ts = np.atleast_1d(np.asarray(ts, dtype=COLUMNS["ts"]))
+        close = np.atleast_1d(np.asarray(close, dtype=COLUMNS["close"]))
+        values = {
+            "open": close if open is None else open,
+            "high": close if high is None else high,
+            "low": close if low is None else low,
+            "close": close,
+            "volume": volume
+        }
+        
+        with self.lock:
+            last = self.read()["ts"][-1:] if len(self) else ()
+            if len(ts) and ((len(last) and ts[0] <= last[0]) or np.any(np.diff(ts) <= 0)):
+                raise ValueError(f"Bars must be appended in strictly increasing time order ({self.path})")
+            
+            rows = len(self)
+            try:
+                for column in VALUE_COLUMNS:
+                    data = np.broadcast_to(np.asarray(values[column], dtype=COLUMNS[column]), ts.shape)
+                    _append_bytes(self._file(column), np.ascontiguousarray(data).tobytes())
+                # Commit: rows become visible once ts is written
+                _append_bytes(self._file("ts"), ts.tobytes())
+            except BaseException:
+                # Roll back partial writes so the next append starts row-aligned
+                self._truncate(rows)
+                raise
+    
+    def read(self, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Zero-copy column views for bars with start <= ts < end (unix ms).
+        
+        The range is found by binary search on the ts column, so the cost
+        doesn't depend on how much history is stored.
+        """
+        maps = self._map()
+        ts = maps["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="left"))
+        return {column: data[lo:hi] for column, data in maps.items()}
+    
+    def tail(self, n: int) -> Dict[str, np.ndarray]:
+        """The last `n` bars - the strategy's lookback window"""
+        maps = self._map()
+        return {column: data[-n:] if n else data[:0] for column, data in maps.items()}
+    
+    def _map(self) -> Dict[str, np.ndarray]:
+        """Memory-map all columns, remapping only when new rows were committed"""
+        rows = len(self)
+        if rows != self._mapped_rows or not self._maps:
+            if rows == 0:
+                maps = {column: np.empty(0, dtype) for column, dtype in COLUMNS.items()}
+            else:
+                maps = {
+                    column: np.memmap(self._file(column), dtype=dtype, mode="r", shape=(rows,))
+                    for column, dtype in COLUMNS.items()
+                }
+            # Swap as one assignment so concurrent readers see a consistent set
+            self._maps, self._mapped_rows = maps, rows
+        return self._maps
+
+
+def _append_bytes(path: str, payload: bytes):
+    with open(path, "ab") as f:
+        f.write(payload)
+
+
+class BarStore:
+    def __init__(self, root: str = config.BAR_STORE_DIR):
+        """Bar series keyed by (chain, token symbol), laid out as <root>/<chain>/<TOKEN>/"""
+        self.root = root
+        self.series_by_key = {}
+        self.lock = threading.Lock()
+        
+    def series(self, token: str, chain: str = "eth") -> BarSeries:
+        key = (chain, token)
+        series = self.series_by_key.get(key)
+        if series is None:
+            if chain not in config.SUPPORTED_CHAINS:
+                raise ValueError(f"Unsupported chain: {chain}")
+            with self.lock:
+                series = self.series_by_key.get(key)
+                if series is None:
+                    series = self.series_by_key[key] = BarSeries(os.path.join(self.root, chain, token))
+        return series
+    
+    def append(self, token: str, ts, close, chain: str = "eth", **fields):
+        self.series(token, chain).append(ts, close=close, **fields)
+    
+    def read(self, token: str, chain: str = "eth", start: Optional[int] = None,
+             end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        return self.series(token, chain).read(start, end)
+    
+    def price_frame(self, tokens: Iterable[str] = tuple(config.TOKENS), chain: str = "eth",
+                    start: Optional[int] = None, end: Optional[int] = None,
+                    field: str = "close") -> "pd.DataFrame":
+        """`price_data` for StatisticalArbitrageStrategy: one column per token, indexed by ts.
+        
+        Series are aligned on timestamp; tokens with no bars in the range
+        are left out.
+        """
+        import pandas as pd  # Only needed here; keeps the live feed path light
+        columns = {}
+        for token in tokens:
+            bars = self.read(token, chain, start, end)
+            if len(bars["ts"]):
+                columns[token] = pd.Series(bars[field], index=pd.Index(bars["ts"], name="ts"), copy=False)
+        if not columns:
+            return pd.DataFrame()
+        return pd.DataFrame(columns)
@@ -0,0 +1,102 @@
+# benchmarks/harness.py - Per-tick timing, peak memory and baseline comparison for the suite
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+QUANTILES = (50, 95, 99)
+
+
+def measure(fn: Callable[[], object], ticks: int = 100, warmup: int = 3, items: int = 1) -> Dict:
+    """Call `fn` `ticks` times and summarize.
+    
+    Latency and throughput come from an untraced run; peak memory from one
+    extra call under tracemalloc, so tracing overhead doesn't skew timings.
+    `items` is the work per call (pairs, tokens...) for throughput.
+    """
+    for _ in range(warmup):
+        fn()
+    
+    latencies = np.empty(ticks)
+    started = time.perf_counter()
+    for i in range(ticks):
+        tick = time.perf_counter()
+        fn()
+        latencies[i] = time.perf_counter() - tick
+    wall = time.perf_counter() - started
+    
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        
+    result = {"ticks": ticks, "mean_ms": float(latencies.mean() * 1e3)}
+    for q, value in zip(QUANTILES, np.percentile(latencies, QUANTILES)):
+        result[f"p{q}_ms"] = float(value * 1e3)
+    result["throughput"] = ticks * items / wall
+    result["peak_kib"] = peak / 1024
+    return result
+
+
+def environment() -> Dict:
+    """Where the numbers came from - baselines only compare fairly on the same box"""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count()
+    }
+
+
+def save_baseline(path: str, results: Dict[str, Dict], params: Dict):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "params": params, "results": results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+    
+    
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float = 0.25,
+            min_delta_ms: float = 0.05) -> List[Tuple[str, str, float, float]]:
+    """Regressions as (case, metric, baseline, current).
+    
+    A case regresses when its p50 or p95 latency, or its peak memory, grows
+    by more than `tolerance`. Latency changes under `min_delta_ms` are timer
+    noise and ignored. Cases missing on either side are skipped.
+    """
+    regressions = []
+    for case, current in results.items():
+        old = baseline.get(case)
+        if not old:
+            continue
+        for metric in ("p50_ms", "p95_ms", "peak_kib"):
+            before, after = old.get(metric), current.get(metric)
+            if before is None or after is None or after <= before * (1 + tolerance):
+                continue
+            if metric.endswith("_ms") and after - before < min_delta_ms:
+                continue
+            regressions.append((case, metric, before, after))
+    return regressions
+
+
+def print_table(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]] = None):
+    print(f"{'case':<40} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>11} {'peak KiB':>10} {'vs base':>8}")
+    for case, r in results.items():
+        old = (baseline or {}).get(case)
+        delta = f"{r['p50_ms'] / old['p50_ms']:.2f}x" if old and old.get("p50_ms") else ""
+        print(f"{case:<40} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} "
+              f"{r['throughput']:>11.1f} {r['peak_kib']:>10.1f} {delta:>8}")
+    sys.stdout.flush()
@@ -0,0 +1,189 @@
+# benchmarks/run_suite.py - Hot-path benchmark suite with JSON baselines and regression flags
+#
+# Usage: python -m benchmarks.run_suite [--quick] [--only pair_scan] [--save]
+#        [--baseline benchmarks/baseline.json] [--tolerance 0.25] [--latency 20]
+#
+# Exits 1 when a case regressed against the saved baseline.
+import argparse
+import contextlib
+import io
+import itertools
+import sys
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_pair_scan import synthetic_prices
+from benchmarks.harness import compare, load_baseline, measure, print_table, save_baseline
+from benchmarks.stubs import StubServer
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+# (name, ticks, items, fn)
+Case = Tuple[str, int, int, Callable[[], object]]
+
+
+def quiet():
+    """The bot prints on every trade/signal; keep the report readable"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def strategy_cases(sizes: List[int], bars_list: List[int]) -> List[Case]:
+    from strategies.stat_arb import StatisticalArbitrageStrategy
+    
+    strategy = StatisticalArbitrageStrategy()
+    cases = []
+    
+    for n, bars in itertools.product(sizes, bars_list):
+        prices = synthetic_prices(n, bars)
+        ticks = 3 if n * n * bars > 5e7 else 10
+        cases.append((f"pair_scan/N{n}xB{bars}", ticks, n * (n - 1) // 2,
+                      lambda prices=prices: strategy.identify_cointegrated_pairs(prices)))
+        
+    for bars in bars_list:
+        pair = synthetic_prices(2, bars, n_factors=1)
+        cases.append((f"features/batch/B{bars}", 20, bars,
+                      lambda pair=pair: strategy.calculate_spread_features(pair)))
+        
+    # One live bar per tick through the streaming path
+    stream = iter(synthetic_prices(2, 100000, n_factors=1).to_numpy())
+    cases.append(("features/stream", 5000, 1,
+                  lambda: strategy.update_features("bench", *next(stream))))
+    
+    # Inference: one feature row per pair in the universe, scored in one batch
+    history = synthetic_prices(2, max(bars_list), n_factors=1)
+    features = strategy.calculate_spread_features(history)
+    labels = (features["spread"].shift(-5) > features["spread"]).astype(int)
+    strategy.train_ml_model(features.iloc[:-5], labels.iloc[:-5])
+    for n in sizes:
+        rows = features.sample(n, replace=True, random_state=1)
+        cases.append((f"signals/batch/N{n}", 20, n,
+                      lambda rows=rows: strategy.generate_signals_batch(rows)))
+    return cases
+
+
+def risk_cases(sizes: List[int]) -> List[Case]:
+    from risk_management import RiskManager
+    
+    risk = RiskManager()
+    rng = np.random.default_rng(3)
+    cases = [("risk/position_size", 5000, 1,
+              lambda: risk.calculate_position_size(signal_strength=0.8, volatility=0.03))]
+    
+    for n in sizes:
+        tokens = [f"T{i}" for i in range(n)]
+        for _ in range(50):
+            risk.update_prices(dict(zip(tokens, 100 * np.exp(rng.normal(0, 0.01, n)))))
+        strengths = rng.random(n).tolist()
+        cases.append((f"risk/size_batch/N{n}", 200, n,
+                      lambda tokens=tokens, strengths=strengths: risk.size_batch(tokens, strengths)))
+    return cases
+
+
+def network_cases(stub: StubServer, token_counts: List[int]) -> List[Case]:
+    import config
+    from gaia_integration import GAIANode
+    from node_health import NodeRouter
+    from price_feed import PriceFeed
+    from signal_cache import SignalCache
+    from trade_ledger import TradeLedger
+    from trading_engine import TradingEngine
+    
+    latency = f"L{stub.latency * 1000:.0f}"
+    
+    # GAIA: three stub nodes, cache off so every tick really fans out
+    with quiet():
+        gaia = GAIANode()
+    gaia.public_nodes = {f"stub{i}": f"{stub.url}/v1" for i in range(3)}
+    gaia.router = NodeRouter(gaia.public_nodes, probe=gaia._probe_node)
+    gaia.signal_cache = SignalCache(ttl=0)
+    market = {"eth_price": 2000, "btc_price": 45000}
+    
+    engine = TradingEngine("bench", stub.url, ledger=TradeLedger(log_dir=None))
+    
+    def gaia_tick():
+        with quiet():
+            return gaia.get_trading_signals(market)
+        
+    def trade_tick():
+        with quiet():
+            return engine.execute_trade("USDC", "WETH", "100", "bench")
+        
+    def portfolio_tick():
+        with quiet():
+            return engine.get_portfolio()
+        
+    cases = [
+        (f"gaia/signals/{latency}", 20, 1, gaia_tick),
+        (f"recall/trade/{latency}", 20, 1, trade_tick),
+        (f"recall/portfolio/{latency}", 20, 1, portfolio_tick)
+    ]
+    
+    import asyncio
+    for n in token_counts:
+        tokens = {f"T{i}": f"0x{i:040x}" for i in range(n)}
+        feed = PriceFeed(tokens, url=f"{stub.url}/simple/token_price/{{platform}}")
+        cases.append((f"price_feed/poll/T{n}/{latency}", 10, n,
+                      lambda feed=feed: asyncio.run(feed.poll_once())))
+    return cases
+
+
+def run(cases: List[Case], only: List[str]) -> Dict[str, Dict]:
+    results = {}
+    for name, ticks, items, fn in cases:
+        if only and not any(part in name for part in only):
+            continue
+        print(f"  running {name}...", end="\r", flush=True)
+        results[name] = measure(fn, ticks=ticks, warmup=min(3, ticks), items=items)
+    print(" " * 60, end="\r")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Strategy, risk and signal hot-path benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200], help="universe sizes")
+    parser.add_argument("--bars", type=int, nargs="+", default=[500, 2000], help="history lengths")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[7, 120], help="price feed universe sizes")
+    parser.add_argument("--latency", type=float, default=20, help="stub API latency, ms")
+    parser.add_argument("--jitter", type=float, default=0, help="extra random stub latency, ms")
+    parser.add_argument("--quick", action="store_true", help="small sizes for a fast smoke run")
+    parser.add_argument("--only", nargs="+", default=[], help="run cases whose name contains any of these")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+    
+    if args.quick:
+        args.sizes, args.bars, args.tokens = [10, 50], [500], [7]
+    params = {key: getattr(args, key) for key in ("sizes", "bars", "tokens", "latency", "jitter")}
+    
+    cases = strategy_cases(args.sizes, args.bars) + risk_cases(args.sizes)
+    with StubServer(latency=args.latency / 1000, jitter=args.jitter / 1000) as stub:
+        results = run(cases + network_cases(stub, args.tokens), args.only)
+        
+    baseline = load_baseline(args.baseline)
+    print_table(results, baseline["results"] if baseline else None)
+    
+    if args.save:
+        save_baseline(args.baseline, results, params)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline} - run with --save to create one")
+        return 0
+    if baseline.get("params") != params:
+        print(f"\n⚠️  Baseline was recorded with {baseline.get('params')}; comparing matching cases only")
+        
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if not regressions:
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+        return 0
+    print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+    for case, metric, before, after in regressions:
+        print(f"   {case:<40} {metric:<8} {before:10.3f} -> {after:10.3f} ({after / before:.2f}x)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
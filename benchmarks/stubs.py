@@ -0,0 +1,122 @@
+# benchmarks/stubs.py - Local HTTP stand-ins for GAIA, Recall and the price API
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SIGNALS = [
+    {"pair": "ETH/USDC", "action": "buy", "confidence": 0.82, "expected_profit": 24.0, "reason": "oversold"},
+    {"pair": "BTC/USDC", "action": "sell", "confidence": 0.74, "expected_profit": 15.5, "reason": "resistance"}
+]
+
+
+class StubServer:
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, stream: bool = True, seed: int = 7):
+        """Threaded local server answering like the external APIs the bot calls.
+        
+        Every request sleeps `latency` seconds (+ up to `jitter`) before
+        answering, standing in for network and model time:
+          POST /v1/chat/completions     GAIA (SSE stream, or JSON if stream=False)
+          GET  /api/portfolio           Recall portfolio
+          POST /api/trade/execute       Recall trade
+          GET  /simple/token_price/<p>  batched token prices
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.stream = stream
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+        
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+    
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="bench-stub", daemon=True)
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+        
+    def _delay(self):
+        self.requests += 1
+        time.sleep(self.latency + (self.random.random() * self.jitter if self.jitter else 0))
+        
+    def _handler(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real APIs
+            
+            def setup(self):
+                super().setup()
+                # Headers and body go out as separate writes; without this, Nagle +
+                # delayed ACK adds ~40ms per keep-alive response and swamps `latency`
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                
+            def log_message(self, *args):
+                pass
+            
+            def _json(self, payload, status=200):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                
+            def do_GET(self):
+                stub._delay()
+                parts = urlsplit(self.path)
+                if parts.path == "/api/portfolio":
+                    self._json({"totalValue": 10000, "tokens": [
+                        {"symbol": "USDC", "amount": 8000, "price": 1.0},
+                        {"symbol": "WETH", "amount": 1, "price": 2000.0}
+                    ]})
+                elif parts.path.startswith("/simple/token_price/"):
+                    addresses = parse_qs(parts.query).get("contract_addresses", [""])[0].split(",")
+                    now = int(time.time())
+                    self._json({a: {"usd": 100 + stub.random.random(), "last_updated_at": now} for a in addresses if a})
+                else:
+                    self._json({"status": "ok"})
+                    
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                stub._delay()
+                if self.path.endswith("/chat/completions"):
+                    self._completion(request)
+                elif self.path == "/api/trade/execute":
+                    self._json({"success": True, "transaction": {
+                        "fromToken": request.get("fromToken"), "toToken": request.get("toToken"),
+                        "fromAmount": float(request.get("amount", 0)), "toAmount": float(request.get("amount", 0))
+                    }})
+                else:
+                    self._json({"error": "not found"}, status=404)
+                    
+            def _completion(self, request):
+                content = "Signals: " + json.dumps(SIGNALS) + " Let me know if you need more."
+                if not (stub.stream and request.get("stream")):
+                    self._json({"choices": [{"message": {"content": content}}]})
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                try:
+                    for i in range(0, len(content), 16):
+                        chunk = {"choices": [{"delta": {"content": content[i:i + 16]}}]}
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.write(b"data: [DONE]\n\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client stopped reading once it had the array
+                self.close_connection = True
+                
+        return Handler
@@ -27,4 +27,104 @@ TOKENS = {
 SUPPORTED_CHAINS = ["eth", "polygon", "bsc", "arbitrum", "base", "optimism", "avalanche", "linea"]
 
 # IMPORTANT: Gas costs are IGNORED in competition!
-GAS_COST = 0  # Don't calculate gas
\ No newline at end of file
+GAS_COST = 0  # Don't calculate gas
+
+# HTTP transport - shared keep-alive pools for Recall and GAIA
+HTTP_POOL_HOSTS = 10      # Number of per-host pools to keep alive
+HTTP_POOL_MAXSIZE = 16    # Max open connections per host
+HTTP_RETRIES = 3          # Retries on connection errors / 429 / 5xx
+HTTP_BACKOFF = 0.3        # Backoff factor: 0.3s, 0.6s, 1.2s ...
+
+# Order pipeline - async submission from the main loop
+ORDER_QUEUE_SIZE = 50     # Orders waiting for a free slot before new ones are rejected
+ORDER_CONCURRENCY = 4     # Orders in flight at once
+ORDER_DEADLINE = 20       # Seconds from submission before an order is abandoned
+
+# Model store - trained scaler + RF/GB ensembles, reused across restarts
+MODEL_STORE_DIR = "models"
+MODEL_LABEL_HORIZON = 5             # Bars ahead used to label up/down moves for startup training
+MODEL_MIN_BARS = 200                # Labelled bars a pair needs before it is trained at startup
+
+# Bar store - append-only, memory-mapped price history per chain/token
+BAR_STORE_DIR = "data/bars"
+
+# Portfolio cache - local state updated from fills, reconciled with the API
+PORTFOLIO_TTL = 15                  # Seconds a snapshot is served without refetching
+PORTFOLIO_RECONCILE_INTERVAL = 60   # Max seconds between server syncs
+PORTFOLIO_DRIFT_TOLERANCE = 0.01    # Relative totalValue gap that counts as drift
+
+# Trade ledger - recent trades in memory, full history in segment logs
+LEDGER_CAPACITY = 1000              # Recent trades kept in memory
+LEDGER_DIR = "data/ledger"
+LEDGER_SEGMENT_BYTES = 16 * 1024 * 1024
+
+# Dashboard - served from inside the bot process
+DASHBOARD_PORT = 5000
+
+# Agent permissions - enforced locally by PreTradeGate and on-chain by the Lit action
+DEFAULT_AGENT_ID = "master_agent"
+AGENT_PERMISSIONS = {
+    "master_agent": {
+        "daily_limit_usd": 10000,
+        "can_delegate": True,
+        "requires_2fa": False
+    },
+    "sub_agents": {
+        "arbitrage_bot": {
+            "daily_limit_usd": 5000,
+            "allowed_tokens": ["WETH", "USDC", "WBTC"],
+            "max_slippage": 0.01,
+            "requires_profit": True
+        },
+        "emergency_bot": {
+            "activation_condition": "drawdown > 10%",
+            "allowed_actions": ["close_all", "withdraw"],
+            "override_limits": True
+        }
+    }
+}
+MULTISIG_THRESHOLD_USD = 5000   # Trades above this need 2 signatures
+MAX_TRADE_RISK = 0.3            # Reject estimated_risk above this unless override_limits
+
+# GAIA signal cache - skip LLM calls when the market hasn't meaningfully moved
+SIGNAL_CACHE_TTL = 60           # Seconds a model's answer stays valid
+SIGNAL_CACHE_SIZE = 256         # Max cached (model, market) entries
+SIGNAL_CACHE_PRECISION = 3      # Significant digits kept when fingerprinting prices
+
+# Opportunity selection - merged from every source, scored once, top-K kept
+OPPORTUNITY_TOP_K = 10              # Opportunities executed per cycle
+OPPORTUNITY_MIN_PROFIT = 10         # USD expected profit; anything at or below is dropped on arrival
+OPPORTUNITY_RISK_AVERSION = 1.0     # Score = profit * confidence * (1 - aversion * risk)
+OPPORTUNITY_SOURCE_TIMEOUT = 10     # Seconds a source gets per cycle before it's skipped
+
+# Hot-path instrumentation - spans, latency histograms and failure counters at /metrics
+INSTRUMENTATION_ENABLED = os.getenv("BOT_INSTRUMENTATION", "1") != "0"
+
+# Price feed - every tracked token polled in batched token_price requests
+PRICE_FEED_URL = "https://api.coingecko.com/api/v3/simple/token_price/{platform}"
+PRICE_FEED_PLATFORM = "ethereum"    # Platform id for the addresses in TOKENS
+PRICE_FEED_API_KEY = os.getenv("COINGECKO_API_KEY")
+PRICE_FEED_BATCH_SIZE = 50          # Contract addresses per request
+PRICE_FEED_INTERVAL = 10            # Seconds between polls
+PRICE_FEED_TIMEOUT = 8
+
+# Cross-chain scanner - same asset priced on every supported chain, spreads above threshold traded
+CROSS_CHAIN_PLATFORMS = {           # Price-API platform id per chain
+    "eth": "ethereum",
+    "polygon": "polygon-pos",
+    "bsc": "binance-smart-chain",
+    "arbitrum": "arbitrum-one",
+    "base": "base",
+    "optimism": "optimistic-ethereum",
+    "avalanche": "avalanche",
+    "linea": "linea"
+}
+CROSS_CHAIN_QUOTE = "USDC"
+CROSS_CHAIN_RATE = 0.05             # Requests per second per chain (3/min - keeps 8 chains under free-tier limits)
+CROSS_CHAIN_BURST = 1
+CROSS_CHAIN_TIMEOUT = 6             # Seconds per chain; a slow chain is skipped, not waited on
+CROSS_CHAIN_MAX_AGE = 180           # Seconds; older chain prices are left out of spreads
+CROSS_CHAIN_MIN_SPREAD = 0.005      # Net spread needed to emit an opportunity
+CROSS_CHAIN_COST = 0.002            # Fees + slippage for the two legs, as a fraction
+CROSS_CHAIN_TRADE_USD = 1000        # Notional used to estimate expected profit
+CROSS_CHAIN_CONFIDENCE = 0.7
@@ -0,0 +1,181 @@
+# cross_chain.py - Parallel per-chain price polling and incremental cross-chain spread tracking
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import config
+from opportunity_engine import ARBITRAGE, Opportunity
+from price_feed import PriceFeed
+from token_registry import STABLECOINS, TokenRegistry, registry as default_registry
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """`rate` requests per second, bursts of up to `capacity`"""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        
+    def try_acquire(self) -> bool:
+        """Take one token if available - never waits"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class SpreadMatrix:
+    def __init__(self, chains: List[str]):
+        """Pairwise price spreads for one asset across chains.
+        
+        spreads[i, j] is the gross return of buying on chain i and selling
+        on chain j. A new price on one chain only rewrites that chain's row
+        and column - O(chains), not O(chains^2).
+        """
+        self.chains = list(chains)
+        self.index = {chain: i for i, chain in enumerate(self.chains)}
+        self.prices = np.full(len(self.chains), np.nan)
+        self.updated = np.zeros(len(self.chains))  # Source update time per chain, unix ms
+        self.spreads = np.full((len(self.chains), len(self.chains)), np.nan)
+        
+    def update(self, chain: str, price: float, ts: int):
+        i = self.index[chain]
+        self.prices[i] = price
+        self.updated[i] = ts
+        self.spreads[i, :] = self.prices / price - 1
+        self.spreads[:, i] = price / self.prices - 1
+        
+    def best(self, max_age: Optional[float] = None) -> Optional[Tuple[str, str, float]]:
+        """(buy_chain, sell_chain, spread) with the widest spread, or None
+        
+        Chains whose price is older than `max_age` seconds are left out, so
+        a fresh quote is never paired with one from a chain that has since
+        failed or been skipped.
+        """
+        spreads = self.spreads
+        if max_age is not None:
+            stale = self.updated < time.time() * 1000 - max_age * 1000
+            if stale.any():
+                spreads = spreads.copy()
+                spreads[stale, :] = np.nan
+                spreads[:, stale] = np.nan
+        if np.isnan(spreads).all():
+            return None
+        i, j = divmod(int(np.nanargmax(spreads)), len(self.chains))
+        return self.chains[i], self.chains[j], float(spreads[i, j])
+
+
+class CrossChainScanner:
+    def __init__(self, tokens: TokenRegistry = default_registry, chains: List[str] = config.SUPPORTED_CHAINS,
+                 quote: str = config.CROSS_CHAIN_QUOTE, min_spread: float = config.CROSS_CHAIN_MIN_SPREAD,
+                 cost: float = config.CROSS_CHAIN_COST, trade_usd: float = config.CROSS_CHAIN_TRADE_USD,
+                 rate: float = config.CROSS_CHAIN_RATE, burst: float = config.CROSS_CHAIN_BURST,
+                 timeout: float = config.CROSS_CHAIN_TIMEOUT, max_age: float = config.CROSS_CHAIN_MAX_AGE):
+        """Prices every asset listed on two or more chains, on all chains at once.
+        
+        Each chain has its own batched PriceFeed and token-bucket limiter; a
+        chain that is out of budget or slower than `timeout` is skipped for
+        that scan and keeps its last prices, so a scan takes as long as the
+        slowest polled chain. Prices older than `max_age` seconds are not
+        compared. Spreads net of `cost` above `min_spread` become one hedged
+        opportunity - a buy on the cheap chain and a sell on the expensive
+        one, kept or dropped together. `min_spread` is the only threshold,
+        so register the scanner with `min_profit=0`. Stablecoins aren't
+        scanned: their cross-chain spreads are depeg noise, not arbitrage.
+        """
+        listed: Dict[str, List[str]] = {}
+        for chain in chains:
+            if chain in config.CROSS_CHAIN_PLATFORMS:
+                for token in tokens.tokens(chain):
+                    if token.symbol != quote and token.symbol not in STABLECOINS:
+                        listed.setdefault(token.symbol, []).append(chain)
+        self.assets = {symbol: chains for symbol, chains in listed.items() if len(chains) > 1}
+        
+        self.feeds: Dict[str, PriceFeed] = {}
+        for chain in chains:
+            chain_tokens = {token.symbol: token.address for token in tokens.tokens(chain) if token.symbol in self.assets}
+            if chain_tokens:
+                self.feeds[chain] = PriceFeed(chain_tokens, platform=config.CROSS_CHAIN_PLATFORMS[chain],
+                                              timeout=timeout)
+        self.limiters = {chain: TokenBucket(rate, burst) for chain in self.feeds}
+        self.matrices = {symbol: SpreadMatrix(chains) for symbol, chains in self.assets.items()}
+        
+        self.quote = quote
+        self.min_spread = min_spread
+        self.cost = cost
+        self.trade_usd = trade_usd
+        self.timeout = timeout
+        self.max_age = max_age
+        self.stats = {"scans": 0, "polled": 0, "rate_limited": 0, "timeouts": 0, "errors": 0, "emitted": 0}
+        self.last_scan = {}
+        
+    async def scan(self) -> List[Opportunity]:
+        """Poll every chain concurrently, update spreads, return new opportunities"""
+        started = time.monotonic()
+        results = await asyncio.gather(*(self._poll_chain(chain) for chain in self.feeds))
+        
+        changed = set()
+        for chain, snapshot in zip(self.feeds, results):
+            if snapshot is None:
+                continue
+            for symbol in snapshot.changed:
+                price = snapshot.prices[symbol]
+                if price > 0:
+                    self.matrices[symbol].update(chain, price, snapshot.updated[symbol])
+                    changed.add(symbol)
+                
+        opportunities = []
+        for symbol in changed:
+            opportunities.extend(self._opportunities(symbol))
+            
+        self.stats["scans"] += 1
+        self.stats["emitted"] += len(opportunities)
+        self.last_scan = {
+            "elapsed": time.monotonic() - started,
+            "chains": sum(snapshot is not None for snapshot in results),
+            "changed": sorted(changed)
+        }
+        return opportunities
+    
+    async def _poll_chain(self, chain: str):
+        if not self.limiters[chain].try_acquire():
+            self.stats["rate_limited"] += 1
+            return None
+        try:
+            snapshot = await asyncio.wait_for(self.feeds[chain].poll_once(), self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            return None
+        except Exception as e:
+            print(f"❌ Cross-chain poll failed on {chain}: {str(e)}")
+            self.stats["errors"] += 1
+            return None
+        self.stats["polled"] += 1
+        return snapshot
+    
+    def _opportunities(self, symbol: str) -> List[Opportunity]:
+        best = self.matrices[symbol].best(self.max_age)
+        if best is None:
+            return []
+        buy_chain, sell_chain, spread = best
+        net = spread - self.cost
+        if net < self.min_spread:
+            return []
+        
+        pair = f"{symbol}/{self.quote}"
+        reason = f"cross-chain {symbol}: buy on {buy_chain}, sell on {sell_chain} ({spread:.2%} gross)"
+        profit = self.trade_usd * net
+        legs = (
+            Opportunity(pair, "buy", config.CROSS_CHAIN_CONFIDENCE, profit / 2, source="cross_chain",
+                        reason=reason, chain=buy_chain),
+            Opportunity(pair, "sell", config.CROSS_CHAIN_CONFIDENCE, profit / 2, source="cross_chain",
+                        reason=reason, chain=sell_chain)
+        )
+        return [Opportunity(pair, ARBITRAGE, config.CROSS_CHAIN_CONFIDENCE, profit, source="cross_chain",
+                            reason=reason, chain=buy_chain, legs=legs)]
@@ -1,30 +1,65 @@
 # dashboard.py - UPDATED VERSION
-from flask import Flask, render_template, jsonify
-import json
-import os
+from flask import Flask, render_template, Response, request
+import threading
+
+from instrumentation import metrics
+from metrics_feed import hub
 
 app = Flask(__name__)
 
+# SSE clients get a comment line at least this often so proxies keep them open
+STREAM_HEARTBEAT = 15
+
 @app.route('/')
 def dashboard():
     return render_template('dashboard.html')
 
 @app.route('/api/performance')
 def get_performance():
-    """Return real performance data"""
-    try:
-        with open('performance.json', 'r') as f:
-            data = json.load(f)
-        return jsonify(data)
-    except:
-        # Default data if file doesn't exist
-        return jsonify({
-            "total_return": 0,
-            "sharpe_ratio": 0,
-            "max_drawdown": 0,
-            "winning_trades": 0,
-            "total_trades": 0
-        })
+    """Return real performance data (cached snapshot, ETag-aware)"""
+    version, body, etag = hub.current()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+@app.route('/api/performance/stream')
+def stream_performance():
+    """Server-Sent Events: pushes each new snapshot as it is published"""
+    def events():
+        version, body, _ = hub.current()
+        yield b"data: " + body + b"\n\n"
+        while True:
+            new_version, body, _ = hub.wait(version, timeout=STREAM_HEARTBEAT)
+            if new_version == version:
+                yield b": heartbeat\n\n"
+                continue
+            version = new_version
+            yield b"data: " + body + b"\n\n"
+    
+    return Response(events(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Hot-path latency histograms and failure counters, Prometheus text format"""
+    return Response(metrics.prometheus(), mimetype="text/plain; version=0.0.4")
+
+def start_in_background(port: int = 5000) -> threading.Thread:
+    """Serve the dashboard from a daemon thread inside the bot process"""
+    thread = threading.Thread(
+        target=app.run,
+        kwargs={"host": "127.0.0.1", "port": port, "threaded": True, "use_reloader": False},
+        name="dashboard",
+        daemon=True
+    )
+    thread.start()
+    return thread
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    app.run(debug=True, port=5000, threaded=True)
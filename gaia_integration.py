@@ -1,9 +1,15 @@
 # gaia_integration.py - FIXED VERSION WITH PUBLIC NODES
 import requests
 import json
-from typing import Dict, List
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional
 import os
 from dotenv import load_dotenv
+from node_health import NodeRouter
+from signal_cache import SignalCache
+from signal_parser import SignalArrayParser, consensus, validate_opportunities
+from transport import get_transport
 
 load_dotenv()
 
@@ -16,6 +22,19 @@ class GAIANode:
             "phi": "https://phi3.gaia.domains/v1"
         }
         
+        self.http = get_transport()
+        self.signal_cache = SignalCache()
+        
+        # Latency/error tracking per node; tripped nodes are probed in the background
+        self.router = NodeRouter(self.public_nodes, probe=self._probe_node)
+        self.router.start_probing()
+        
+        # One worker per node so a slow model never queues behind another
+        self.executor = ThreadPoolExecutor(
+            max_workers=len(self.public_nodes),
+            thread_name_prefix="gaia"
+        )
+        
         # Get API key from https://gaianet.ai/
         self.api_key = os.getenv("GAIA_API_KEY")
         if not self.api_key:
@@ -30,73 +49,182 @@ class GAIANode:
         
         models = {}
         
-        # Test each public node
-        for name, endpoint in self.public_nodes.items():
-            try:
-                response = requests.post(
-                    f"{endpoint}/chat/completions",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                    json={
-                        "model": "default",
-                        "messages": [{"role": "user", "content": "test"}],
-                        "max_tokens": 10
-                    },
-                    timeout=5
-                )
-                
-                if response.ok:
+        # Probe all public nodes at once - startup waits for the slowest, not the sum
+        nodes = list(self.public_nodes.items())
+        with ThreadPoolExecutor(max_workers=len(nodes), thread_name_prefix="gaia-probe") as pool:
+            ready = pool.map(lambda node: self._probe_node(*node, verbose=True), nodes)
+            
+            for (name, endpoint), ok in zip(nodes, ready):
+                if ok:
                     models[name] = endpoint
-                    print(f"✅ {name} node ready: {endpoint}")
                 else:
-                    print(f"❌ {name} node failed: {response.status_code}")
-                    
-            except Exception as e:
-                print(f"❌ {name} node error: {str(e)}")
+                    self.router.trip(name)
                 
         return models
     
-    def get_trading_signals(self, market_data: Dict) -> List[Dict]:
-        """Get signals from multiple GAIA models"""
-        signals = []
+    def _probe_node(self, name: str, endpoint: str, verbose: bool = False) -> bool:
+        """Cheap test completion - True if the node answers"""
+        try:
+            response = self.http.post(
+                f"{endpoint}/chat/completions",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json={
+                    "model": "default",
+                    "messages": [{"role": "user", "content": "test"}],
+                    "max_tokens": 10
+                },
+                timeout=5
+            )
+            
+            if response.ok:
+                if verbose:
+                    print(f"✅ {name} node ready: {endpoint}")
+                return True
+            if verbose:
+                print(f"❌ {name} node failed: {response.status_code}")
+                
+        except Exception as e:
+            if verbose:
+                print(f"❌ {name} node error: {str(e)}")
+            
+        return False
+    
+    def get_trading_signals(self, market_data: Dict, deadline: float = 8.0,
+                            quorum: Optional[int] = None, fanout: Optional[int] = None) -> List[Dict]:
+        """Get signals from multiple GAIA models, queried concurrently.
+        
+        Only healthy nodes are asked (the `fanout` fastest, default all).
+        Returns as soon as `quorum` nodes have answered (default: a majority)
+        or `deadline` seconds have passed, whichever comes first. Nodes that
+        have not answered by then are dropped for this cycle. The answers
+        are merged by a per-pair vote (signal_parser.consensus), so each
+        pair comes back at most once.
+        """
+        nodes = self.router.select(fanout)
+        if not nodes:
+            print("⚠️  No healthy GAIA nodes - skipping signals this cycle")
+            return []
         
         prompt = f"""Analyze this market data and find trading opportunities:
         {json.dumps(market_data, indent=2)}
         
         Return ONLY a JSON array of opportunities like:
-        [{{"pair": "ETH/USDC", "action": "buy", "confidence": 0.85, "reason": "oversold"}}]
+        [{{"pair": "ETH/USDC", "action": "buy", "confidence": 0.85, "expected_profit": 25.0, "reason": "oversold"}}]
+        expected_profit is the estimated profit in USD. action is buy, sell or hold.
         """
         
-        # Query multiple models for consensus
-        for name, endpoint in self.public_nodes.items():
-            try:
-                response = requests.post(
-                    f"{endpoint}/chat/completions",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                    json={
-                        "model": "default",
-                        "messages": [
-                            {"role": "system", "content": "You are a crypto trading AI. Return only valid JSON."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": 0.1,
-                        "max_tokens": 200
-                    },
-                    timeout=10
-                )
+        if quorum is None:
+            quorum = len(nodes) // 2 + 1
+        
+        # Query all models at once for consensus
+        started = time.monotonic()
+        expires_at = started + deadline
+        pending = {
+            self.executor.submit(self._query_node, name, endpoint, market_data, prompt, expires_at): name
+            for name, endpoint in nodes
+        }
+        
+        answers = []
+        while pending and len(answers) < quorum:
+            remaining = deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                opportunities = future.result()
+                if opportunities is not None:
+                    answers.append(opportunities)
+        
+        # Cancel stragglers - queued ones never start, running ones are
+        # bounded by the request timeout and their result is discarded
+        for future in pending:
+            future.cancel()
+        if pending:
+            print(f"⏱️  GAIA: skipped {', '.join(pending.values())} after {time.monotonic() - started:.1f}s")
                 
+        return consensus(answers)
+    
+    def _query_node(self, name: str, endpoint: str, market_data: Dict, prompt: str,
+                    expires_at: float) -> Optional[List[Dict]]:
+        """Query a single GAIA node, reusing its last answer if the market hasn't moved"""
+        return self.signal_cache.get_or_call(
+            name, market_data, lambda: self._fetch_signals(name, endpoint, prompt, expires_at)
+        )
+    
+    def _fetch_signals(self, name: str, endpoint: str, prompt: str, expires_at: float) -> Optional[List[Dict]]:
+        """Ask one GAIA node. Returns None if the node gave no usable answer.
+        
+        The request gets whatever is left until `expires_at` (monotonic) as
+        its timeout. The completion is streamed and the stream is closed as
+        soon as the first complete JSON array has arrived, so prose or a
+        second copy of the answer after it costs neither tokens nor wall time.
+        """
+        started = time.monotonic()
+        timeout = expires_at - started
+        if timeout <= 0:
+            return None  # Queued past the fan-out deadline - the answer would be discarded anyway
+        try:
+            response = self.http.post(
+                f"{endpoint}/chat/completions",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json={
+                    "model": "default",
+                    "messages": [
+                        {"role": "system", "content": "You are a crypto trading AI. Return only valid JSON."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": 0.1,
+                    "max_tokens": 200,
+                    "stream": True
+                },
+                timeout=timeout,
+                stream=True
+            )
+            
+            with response:
                 if response.ok:
-                    result = response.json()
-                    content = result["choices"][0]["message"]["content"]
+                    array, content = self._read_signal_array(response)
+                    latency = time.monotonic() - started
                     
-                    # Try to parse JSON
-                    try:
-                        opportunities = json.loads(content)
-                        signals.extend(opportunities)
-                    except:
-                        # Fallback if JSON parsing fails
-                        print(f"⚠️  {name} returned non-JSON: {content[:100]}")
-                        
-            except Exception as e:
-                print(f"❌ Error querying {name}: {str(e)}")
+                    if array is not None:
+                        self.router.record_success(name, latency)
+                        return validate_opportunities(array)
+                    print(f"⚠️  {name} returned non-JSON: {content[:100]}")
+                    self.router.record_failure(name, "parse", latency)
+                else:
+                    print(f"❌ {name} signal request failed: {response.status_code}")
+                    self.router.record_failure(name, "error", time.monotonic() - started)
                 
-        return signals
\ No newline at end of file
+        except requests.exceptions.Timeout:
+            print(f"❌ {name} timed out after {timeout:.2f}s")
+            self.router.record_failure(name, "timeout", time.monotonic() - started)
+        except Exception as e:
+            print(f"❌ Error querying {name}: {str(e)}")
+            self.router.record_failure(name, "error", time.monotonic() - started)
+            
+        return None
+    
+    def _read_signal_array(self, response):
+        """(array or None, text seen) from a streamed or plain completion"""
+        parser = SignalArrayParser()
+        
+        # Nodes that ignore "stream" answer with a single JSON body
+        if "text/event-stream" not in response.headers.get("Content-Type", ""):
+            content = response.json()["choices"][0]["message"]["content"]
+            return parser.feed(content), content
+        
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            try:
+                delta = json.loads(data)["choices"][0].get("delta", {})
+            except (ValueError, KeyError, IndexError):
+                continue
+            if parser.feed(delta.get("content") or "") is not None:
+                break
+        return parser.result, parser.text
\ No newline at end of file
@@ -0,0 +1,256 @@
+# instrumentation.py - Span timers, latency histograms and failure counters (Prometheus export)
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from urllib3.exceptions import TimeoutError as Urllib3Timeout
+
+import config
+
+# Sub-buckets per power of two: 2^4 = 16 -> at most ~6% relative error
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_EXPONENT = 40   # Microseconds; 2^40 us is ~12 days, plenty for any call
+
+# Coarse bucket edges (seconds) used when exporting to Prometheus
+EXPORT_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+EXPORT_QUANTILES = (0.5, 0.95, 0.99)
+
+TIMEOUT_ERRORS = (TimeoutError, requests.exceptions.Timeout, Urllib3Timeout)
+
+
+def is_timeout(exc: BaseException) -> bool:
+    """True for timeouts, including read timeouts urllib3's Retry wraps in a ConnectionError"""
+    if isinstance(exc, TIMEOUT_ERRORS):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, TIMEOUT_ERRORS)
+
+
+def _bucket(micros: int) -> int:
+    if micros < SUB_BUCKETS:
+        return max(micros, 0)
+    shift = micros.bit_length() - 1 - SUB_BUCKET_BITS
+    return ((shift + 1) << SUB_BUCKET_BITS) + (micros >> shift) - SUB_BUCKETS
+
+
+def _bucket_upper(index: int) -> float:
+    """Upper edge of a bucket, in seconds"""
+    if index < SUB_BUCKETS:
+        return (index + 1) / 1e6
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    return (((index & (SUB_BUCKETS - 1)) + SUB_BUCKETS + 1) << shift) / 1e6
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max", "lock")
+    
+    def __init__(self):
+        """HDR-style log-linear histogram of durations.
+        
+        Each power-of-two range of microseconds is split into SUB_BUCKETS
+        linear buckets, so recording is O(1) with a fixed-size array and
+        quantiles stay within a few percent at any scale.
+        """
+        self.counts = [0] * ((MAX_EXPONENT + 1) << SUB_BUCKET_BITS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+        
+    def record(self, seconds: float):
+        index = min(_bucket(int(seconds * 1e6)), len(self.counts) - 1)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+                
+    def quantile(self, q: float) -> float:
+        with self.lock:
+            counts, count = list(self.counts), self.count
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for index, n in enumerate(counts):
+            seen += n
+            if n and seen >= rank:
+                return min(_bucket_upper(index), self.max)
+        return self.max
+    
+    def cumulative(self, bounds: Tuple[float, ...]) -> List[int]:
+        """Observations <= each bound (bucketed, so edges are approximate)"""
+        with self.lock:
+            counts = list(self.counts)
+        result, seen, index = [], 0, 0
+        for bound in bounds:
+            while index < len(counts) and _bucket_upper(index) <= bound:
+                seen += counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+
+class _NullSpan:
+    """Shared do-nothing span handed out while instrumentation is off"""
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("registry", "family", "name", "started")
+    
+    def __init__(self, registry: "Instrumentation", family: str, name: str):
+        self.registry = registry
+        self.family = family
+        self.name = name
+        
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.family, self.name, time.perf_counter() - self.started)
+        if exc_type is not None:
+            kind = "timeouts" if is_timeout(exc) else "failures"
+            self.registry.increment(kind, self.name)
+        return False
+
+
+class Instrumentation:
+    def __init__(self, enabled: bool = config.INSTRUMENTATION_ENABLED, prefix: str = "bot"):
+        """Latency histograms per (family, name) and counters per (kind, name).
+        
+        Families are e.g. "phase" (spans around trading-cycle steps) and
+        "http" (one per endpoint). When disabled, span() returns a shared
+        no-op and observe()/increment() return immediately.
+        """
+        self.enabled = enabled
+        self.prefix = prefix
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.counters: Dict[Tuple[str, str], int] = {}
+        self.gauges: Dict[str, Tuple[Callable[[], Dict], Optional[str]]] = {}
+        self.lock = threading.Lock()
+        
+    def span(self, name: str, family: str = "phase"):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, family, name)
+    
+    def observe(self, family: str, name: str, seconds: float):
+        if not self.enabled:
+            return
+        histogram = self.histograms.get((family, name))
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault((family, name), Histogram())
+        histogram.record(seconds)
+        
+    def increment(self, kind: str, name: str, amount: int = 1):
+        """kind is "failures" or "timeouts"; name is the phase or endpoint"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[(kind, name)] = self.counters.get((kind, name), 0) + amount
+            
+    def add_gauges(self, name: str, collect: Callable[[], Dict], label: Optional[str] = None):
+        """Export `collect()` as gauges named <prefix>_<name>_<key>, read at scrape time.
+        
+        `collect` returns {key: value}, or with `label` set, {label value:
+        {key: value}}. Booleans export as 0/1; non-numeric values are skipped.
+        """
+        with self.lock:
+            self.gauges[name] = (collect, label)
+            
+    def histogram(self, family: str, name: str) -> Optional[Histogram]:
+        return self.histograms.get((family, name))
+    
+    def summary(self) -> Dict[str, Dict]:
+        """p50/p95/p99/max per histogram, for logs and the console"""
+        with self.lock:
+            histograms = dict(self.histograms)
+        return {
+            f"{family}:{name}": {
+                "count": h.count,
+                **{f"p{int(q * 100)}": h.quantile(q) for q in EXPORT_QUANTILES},
+                "max": h.max
+            }
+            for (family, name), h in sorted(histograms.items())
+        }
+    
+    def prometheus(self) -> str:
+        """Prometheus text exposition (format 0.0.4)"""
+        with self.lock:
+            histograms = dict(self.histograms)
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            
+        lines = []
+        by_family: Dict[str, List[Tuple[str, Histogram]]] = {}
+        for (family, name), h in sorted(histograms.items()):
+            by_family.setdefault(family, []).append((name, h))
+            
+        for family, entries in by_family.items():
+            label = "endpoint" if family == "http" else family
+            metric = f"{self.prefix}_{family}_latency_seconds"
+            lines.append(f"# HELP {metric} Latency per {label}")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, h in entries:
+                labels = f'{label}="{_escape(name)}"'
+                for bound, seen in zip(EXPORT_BOUNDS, h.cumulative(EXPORT_BOUNDS)):
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {seen}')
+                lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {h.count}')
+                lines.append(f"{metric}_sum{{{labels}}} {h.total:.6f}")
+                lines.append(f"{metric}_count{{{labels}}} {h.count}")
+                
+            # Fine-grained quantiles from the full-resolution buckets
+            lines.append(f"# TYPE {metric}_quantile gauge")
+            for name, h in entries:
+                for q in EXPORT_QUANTILES:
+                    lines.append(f'{metric}_quantile{{{label}="{_escape(name)}",quantile="{q}"}} {h.quantile(q):.6f}')
+                    
+        for kind in ("failures", "timeouts"):
+            metric = f"{self.prefix}_{kind}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for (counter_kind, name), value in sorted(counters.items()):
+                if counter_kind == kind:
+                    lines.append(f'{metric}{{name="{_escape(name)}"}} {value}')
+                    
+        for name, (collect, label) in sorted(gauges.items()):
+            try:
+                values = collect()
+            except Exception:
+                continue  # A broken collector must not take down the whole scrape
+            rows = values.items() if label else [(None, values)]
+            series: Dict[str, List[str]] = {}
+            for label_value, row in rows:
+                labels = f'{{{label}="{_escape(str(label_value))}"}}' if label else ""
+                for key, value in row.items():
+                    if isinstance(value, (bool, int, float)):
+                        series.setdefault(key, []).append(f"{labels} {float(value)}")
+            for key, samples in series.items():
+                metric = f"{self.prefix}_{name}_{key}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.extend(f"{metric}{sample}" for sample in samples)
+                
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide registry - the dashboard exports it at /metrics
+metrics = Instrumentation()
+span = metrics.span
@@ -3,9 +3,10 @@ import requests
 import json
 import hashlib
 from typing import Dict, List
-from eth_account import Account
 import secrets
 
+import config
+
 class LitProtocolAgent:
     def __init__(self):
         self.lit_node_url = "https://habanero.lit-protocol.com:7370"
@@ -15,6 +16,9 @@ class LitProtocolAgent:
     def create_pkp_wallet(self) -> Dict:
         """Create a PKP wallet for the trading agent"""
         # For hackathon, simulate PKP creation
+        # eth_account takes ~1s to import and is only needed here
+        from eth_account import Account
+        
         private_key = secrets.token_hex(32)
         account = Account.from_key(private_key)
         
@@ -34,26 +38,7 @@ class LitProtocolAgent:
         lit_action_code = """
         const RiskGatedMultiAgentDelegator = async () => {
             // User-defined permissions
-            const permissions = {
-                master_agent: {
-                    daily_limit_usd: 10000,
-                    can_delegate: true,
-                    requires_2fa: false
-                },
-                sub_agents: {
-                    arbitrage_bot: {
-                        daily_limit_usd: 5000,
-                        allowed_tokens: ["WETH", "USDC", "WBTC"],
-                        max_slippage: 0.01,
-                        requires_profit: true
-                    },
-                    emergency_bot: {
-                        activation_condition: "drawdown > 10%",
-                        allowed_actions: ["close_all", "withdraw"],
-                        override_limits: true
-                    }
-                }
-            };
+            const permissions = __PERMISSIONS__;
             
             // Check which agent is calling
             const callingAgent = params.agent_id;
@@ -63,7 +48,7 @@ class LitProtocolAgent:
             const trade = params.trade_request;
             
             // Risk checks
-            if (trade.estimated_risk > 0.3 && !agentPermissions.override_limits) {
+            if (trade.estimated_risk > __MAX_RISK__ && !agentPermissions.override_limits) {
                 return { error: "Risk too high", risk_score: trade.estimated_risk };
             }
             
@@ -79,7 +64,7 @@ class LitProtocolAgent:
             }
             
             // Multi-sig for large trades
-            if (trade.amount_usd > 5000) {
+            if (trade.amount_usd > __MULTISIG_USD__) {
                 const signatures = await requestMultiSig(trade);
                 if (signatures.length < 2) {
                     return { error: "Requires 2 signatures for large trades" };
@@ -111,6 +96,14 @@ class LitProtocolAgent:
         RiskGatedMultiAgentDelegator();
         """
         
+        # Same policy the local PreTradeGate enforces (single source: config.py)
+        lit_action_code = (
+            lit_action_code
+            .replace("__PERMISSIONS__", json.dumps(config.AGENT_PERMISSIONS, indent=4))
+            .replace("__MAX_RISK__", str(config.MAX_TRADE_RISK))
+            .replace("__MULTISIG_USD__", str(config.MULTISIG_THRESHOLD_USD))
+        )
+        
         # This would be uploaded to IPFS in production
         ipfs_cid = "Qm" + hashlib.sha256(lit_action_code.encode()).hexdigest()[:44]
         
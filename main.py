@@ -3,8 +3,33 @@ import asyncio
 import json
 import time
 from datetime import datetime
+import threading
 import traceback
 import sys
+from typing import Dict, List, Optional
+
+from startup import timer
+
+# The ML stack (pandas, sklearn, ta) and Flask are imported on first use,
+# not here - see the strategy property and run()
+with timer.phase("import trading core"):
+    import config
+    from trading_engine import TradingEngine
+    from risk_management import RiskManager
+    from order_pipeline import OrderPipeline
+    from pretrade_gate import PreTradeGate
+    from portfolio_cache import PortfolioCache
+    from metrics_feed import PerformanceTracker
+    from opportunity_engine import OpportunityEngine
+    from cross_chain import CrossChainScanner
+    from instrumentation import metrics, span
+    from price_feed import PriceFeed, PriceSnapshot
+    from bar_store import BarStore
+    from token_registry import UnknownTokenError, registry
+    
+with timer.phase("import integrations"):
+    from lit_integration import LitProtocolAgent
+    from gaia_integration import GAIANode
 
 class AutonomousApesBot:
     def __init__(self):
@@ -15,20 +40,74 @@ class AutonomousApesBot:
             print("❌ RECALL_API_KEY not found in .env!")
             sys.exit(1)
             
-        self.engine = TradingEngine(config.RECALL_API_KEY, config.BASE_URL)
-        self.strategy = StatisticalArbitrageStrategy()
-        self.lit_agent = LitProtocolAgent()
-        self.gaia_node = GAIANode()
-        self.risk_manager = RiskManager()
+        with timer.phase("init engine"):
+            self.engine = TradingEngine(config.RECALL_API_KEY, config.BASE_URL)
+            self._strategy = None
+            self._strategy_lock = threading.Lock()
+            self.lit_agent = LitProtocolAgent()
+            self.gaia_node = GAIANode()
+            self.risk_manager = RiskManager()
+            self.order_pipeline = OrderPipeline(self.engine, gate=PreTradeGate())
+        
+        # Local portfolio state - sizing reads this instead of the API
+        self.portfolio = PortfolioCache(self.engine)
+        self.portfolio.bind_risk_manager(self.risk_manager)
+        self.portfolio.subscribe(self._sync_risk_positions)
+        
+        # Running metrics for the dashboard, updated as trades land
+        self.performance = PerformanceTracker(ledger=self.engine.ledger)
+        self.portfolio.subscribe(self.performance.on_portfolio)
+        self.engine.trade_listeners.append(self.performance.on_trade)
+        
+        # GAIA cache effectiveness and per-node health, on /metrics and the dashboard
+        metrics.add_gauges("signal_cache", self.gaia_node.signal_cache.metrics)
+        metrics.add_gauges("gaia_node", self.gaia_node.router.snapshot, label="node")
+        self.performance.add_section("signal_cache", self.gaia_node.signal_cache.metrics)
+        self.performance.add_section("gaia_nodes", self.gaia_node.router.snapshot)
+        
+        # Every opportunity source feeds one scored top-K per cycle
+        self.opportunities = OpportunityEngine()
+        self.opportunities.add_producer("gaia", self._gaia_opportunities)
+        self.cross_chain = CrossChainScanner()
+        # The scanner gates on net spread itself - the USD floor would silently raise that bar
+        self.opportunities.add_producer("cross_chain", self.cross_chain.scan, min_profit=0)
+        
+        # Live prices for every tracked token, fanned out to risk, storage and features
+        self.price_feed = PriceFeed()
+        self.bars = BarStore()
+        self.price_feed.subscribe(self._on_prices)
         
         # Competition tracking
         self.competition_mode = "sandbox" in config.BASE_URL
         
+    @property
+    def market_data(self) -> Dict:
+        """Market snapshot fed to GAIA, from the latest price feed poll"""
+        prices = self.price_feed.snapshot.prices
+        return {
+            "eth_price": prices.get("WETH"),
+            "btc_price": prices.get("WBTC"),
+            "prices": dict(prices)
+        }
+    
+    @property
+    def strategy(self):
+        """Stat-arb strategy, created (and the ML stack imported) on first use"""
+        if self._strategy is None:
+            # First use can come from the startup model thread and the loop at once
+            with self._strategy_lock:
+                if self._strategy is None:
+                    with timer.phase("load ML stack"):
+                        from strategies.model_store import ModelStore
+                        from strategies.stat_arb import StatisticalArbitrageStrategy
+                        self._strategy = StatisticalArbitrageStrategy(model_store=ModelStore())
+        return self._strategy
+        
     async def check_api_status(self) -> bool:
         """Check if API is working (maintenance issues from Discord)"""
         try:
-            portfolio = self.engine.get_portfolio()
-            if portfolio:
+            portfolio = await asyncio.to_thread(self.portfolio.get)
+            if portfolio.get("totalValue"):
                 print("✅ API is working")
                 return True
             else:
@@ -47,16 +126,31 @@ class AutonomousApesBot:
         print("⛽ Gas costs: IGNORED")
         print(f"🔗 Endpoint: {config.BASE_URL}")
         
+        # Orders go out in the background while we keep scanning
+        await self.order_pipeline.start()
+        
+        # First snapshot before the first cycle, then prices poll on their own schedule
+        await self.price_feed.poll_once()
+        self.price_feed.start()
+        
         # Aggressive trading for competition
         while True:
             try:
-                # 1. Get all market opportunities
-                opportunities = await self.find_all_opportunities()
-                
-                # 2. Execute ALL profitable trades
-                for opp in opportunities:
-                    if opp["expected_profit"] > 10:  # $10 minimum
-                        await self.execute_opportunity(opp)
+                with span("cycle"):
+                    # 0. Keep RiskManager capital current (network only when stale)
+                    with span("portfolio"):
+                        await asyncio.to_thread(self.portfolio.get)
+                    
+                    # 1. Get all market opportunities
+                    with span("opportunities"):
+                        opportunities = await self.find_all_opportunities()
+                    
+                    # 2. Size the selected trades in one risk pass, then execute
+                    with span("sizing"):
+                        self.size_opportunities(opportunities)
+                    with span("order.submit"):
+                        for opp in opportunities:
+                            await self.execute_opportunity(opp)
                         
                 # 3. Sleep briefly
                 await asyncio.sleep(5)  # Check every 5 seconds in competition
@@ -67,25 +161,148 @@ class AutonomousApesBot:
                 await asyncio.sleep(10)
     
     async def find_all_opportunities(self) -> List[Dict]:
-        """Find opportunities using ALL methods"""
-        all_opportunities = []
+        """Find opportunities using ALL methods.
         
+        Sources run concurrently; results are deduplicated by pair and
+        direction, scored, and only the top OPPORTUNITY_TOP_K above the
+        OPPORTUNITY_MIN_PROFIT threshold come back, best first.
+        """
         # 1. GAIA signals (CRITICAL for prize)
-        gaia_signals = self.gaia_node.get_trading_signals({
-            "eth_price": 2000,
-            "btc_price": 45000,
-            "market_trend": "volatile"
-        })
-        all_opportunities.extend(gaia_signals)
-        
         # 2. Statistical arbitrage
-        # 3. Cross-DEX arbitrage
+        # 3. Cross-chain arbitrage (CrossChainScanner)
         # 4. Liquidation hunting
+        return await self.opportunities.collect_dicts()
+    
+    async def _gaia_opportunities(self) -> List[Dict]:
+        # Blocking fan-out - keep it off the event loop
+        return await asyncio.to_thread(self.gaia_node.get_trading_signals, self.market_data)
+    
+    async def execute_opportunity(self, opp: Dict) -> Optional[asyncio.Future]:
+        """Queue an opportunity as an order - returns without waiting for the fill.
+        
+        A hedged opportunity queues all of its legs or none of them.
+        """
+        if opp.get("legs"):
+            orders = [self.build_order(leg) for leg in opp["legs"]]
+            if not all(orders):
+                return None
+            return asyncio.gather(*self.order_pipeline.submit_group(orders, callback=self._on_order_done))
+        order = self.build_order(opp)
+        if not order:
+            return None
+        return self.order_pipeline.submit(order, callback=self._on_order_done)
+    
+    def build_order(self, opp: Dict) -> Optional[Dict]:
+        """Turn a signal like {"pair": "ETH/USDC", "action": "buy"} into an order"""
+        try:
+            base, quote = [self._token_symbol(s) for s in opp["pair"].split("/")]
+        except (KeyError, ValueError):
+            print(f"⚠️  Skipping malformed opportunity: {opp}")
+            return None
+        chain = opp.get("chain", "eth")
+        try:
+            registry.resolve(base, chain)
+            registry.resolve(quote, chain)
+        except UnknownTokenError as e:
+            print(f"⚠️  Skipping {opp['pair']}: {str(e)}")
+            return None
+        
+        size_usd = opp.get("size_usd")
+        if size_usd is None:
+            size_usd = self.risk_manager.calculate_position_size(
+                signal_strength=opp.get("confidence", 0),
+                volatility=opp.get("volatility", 0)
+            )
+        if size_usd <= 0:
+            return None
+        
+        if opp.get("action") == "buy":
+            from_token, to_token, amount = quote, base, size_usd
+        elif opp.get("action") == "sell":
+            price = self._token_price(base)
+            if not price:
+                return None
+            from_token, to_token, amount = base, quote, size_usd / price
+        else:
+            return None
+        
+        return {
+            "from_token": from_token,
+            "to_token": to_token,
+            "amount": f"{amount:.8f}",
+            "reason": opp.get("reason", f"{opp['action']} {opp['pair']}"),
+            "amount_usd": size_usd,
+            "expected_profit": opp.get("expected_profit", 0),
+            "estimated_risk": opp.get("risk", 0),
+            "chain": chain
+        }
+    
+    def size_opportunities(self, opportunities: List[Dict]):
+        """Portfolio-aware sizing for the whole batch (sets opp["size_usd"]).
         
-        # Sort by profit potential
-        all_opportunities.sort(key=lambda x: x.get("expected_profit", 0), reverse=True)
+        Legs of a hedged opportunity are sized with the batch, then all set
+        to the smallest leg's size so the hedge stays balanced.
+        """
+        candidates = []
+        for opp in opportunities:
+            candidates.extend(opp.get("legs") or [opp])
+        sized = [opp for opp in candidates if opp.get("action") in ("buy", "sell") and "/" in opp.get("pair", "")]
+        if not sized:
+            return
+        sizes = self.risk_manager.size_batch(
+            [self._token_symbol(opp["pair"].split("/")[0]) for opp in sized],
+            [opp.get("confidence", 0) for opp in sized],
+            sides=[1 if opp["action"] == "buy" else -1 for opp in sized]
+        )
+        for opp, size in zip(sized, sizes.tolist()):
+            opp["size_usd"] = size
+        for opp in opportunities:
+            if opp.get("legs"):
+                size = min(leg.get("size_usd", 0) for leg in opp["legs"])
+                opp["size_usd"] = size
+                for leg in opp["legs"]:
+                    leg["size_usd"] = size
+    
+    def _sync_risk_positions(self, snapshot: Dict):
+        """Portfolio listener: USD exposure per non-stable token for the risk engine"""
+        positions = {}
+        for symbol, amount in snapshot.items():
+            price = self._token_price(symbol)
+            if symbol not in ("totalValue", "USDC", "USDT") and price:
+                positions[symbol] = amount * price
+        self.risk_manager.set_positions(positions)
+    
+    def _token_symbol(self, symbol: str) -> str:
+        """Map signal symbols to tradable ERC-20s (ETH -> WETH, BTC -> WBTC)"""
+        symbol = symbol.strip().upper()
+        return {"ETH": "WETH", "BTC": "WBTC"}.get(symbol, symbol)
+    
+    def _token_price(self, symbol: str) -> Optional[float]:
+        if symbol in ("USDC", "USDT"):
+            return 1.0
+        # Live feed first, then the last prices the portfolio endpoint reported
+        return self.price_feed.snapshot.prices.get(symbol) or self.portfolio.prices.get(symbol)
+    
+    def _on_prices(self, snapshot: PriceSnapshot):
+        """Price feed subscriber: one new bar per changed token"""
+        changed = {symbol: snapshot.prices[symbol] for symbol in snapshot.changed}
+        self.risk_manager.update_prices(changed)
         
-        return all_opportunities[:10]  # Top 10 opportunities
+        for symbol, price in changed.items():
+            try:
+                self.bars.append(symbol, snapshot.updated[symbol], close=price)
+            except ValueError:
+                pass  # Not newer than the stored history (e.g. right after a restart) - nothing to add
+        
+        # Only keep features warm once the strategy is in use - never load the ML stack from here
+        if self._strategy is not None:
+            for a, b in self._strategy.pair_stats:
+                if (a in changed or b in changed) and a in snapshot.prices and b in snapshot.prices:
+                    self._strategy.update_features(f"{a}/{b}", snapshot.prices[a], snapshot.prices[b])
+    
+    def _on_order_done(self, order: Dict, result: Dict):
+        if not result.get("success"):
+            print(f"⚠️  Order {order['from_token']} → {order['to_token']} failed: {result.get('error')}")
     
     async def run(self):
         """Main entry point"""
@@ -93,32 +310,66 @@ class AutonomousApesBot:
         print("🦍 AUTONOMOUS APES BOT - READY TO DOMINATE")
         print("="*60)
         
-        # Check API status first
-        if not await self.check_api_status():
-            print("⚠️  API issues detected. Waiting 30 seconds...")
-            await asyncio.sleep(30)
+        # Dashboard runs in-process and reads the published metrics snapshot
+        with timer.phase("start dashboard"):
+            import dashboard
+            dashboard.start_in_background(config.DASHBOARD_PORT)
+        print(f"📊 Dashboard: http://127.0.0.1:{config.DASHBOARD_PORT}")
         
-        # Setup all systems
+        # GAIA probes, the PKP wallet and model warm start don't gate trading:
+        # they run while the API is checked, and nodes that fail their probe
+        # get tripped
         print("\n📦 Setting up systems...")
+        setup = asyncio.gather(
+            asyncio.to_thread(self._setup_gaia),
+            asyncio.to_thread(self._setup_wallet),
+            asyncio.to_thread(self._setup_models),
+            return_exceptions=True
+        )
+        setup.add_done_callback(lambda f: f.cancelled() or timer.report("Full startup"))
         
-        # 1. GAIA setup
-        gaia_models = self.gaia_node.setup_gaia_models()
-        if not gaia_models:
-            print("⚠️  No GAIA models available - get API key from https://gaianet.ai/")
-        
-        # 2. Vincent/Lit setup
-        self.lit_agent.create_pkp_wallet()
+        # Check API status first
+        with timer.phase("API status check"):
+            api_ok = await self.check_api_status()
+        if not api_ok:
+            print("⚠️  API issues detected. Waiting 30 seconds...")
+            await asyncio.sleep(30)
         
-        # 3. Check competition mode
+        # Check competition mode
         if not self.competition_mode:
             print("\n⚠️  SANDBOX MODE - Switch to production URL for competition!")
             print("   Edit config.py and change BASE_URL")
         
+        timer.report("Time to trading loop")
+        
         # Start appropriate mode
-        if self.competition_mode:
-            await self.run_sandbox_mode()
-        else:
-            await self.run_competition_mode()
+        try:
+            if self.competition_mode:
+                await self.run_sandbox_mode()
+            else:
+                await self.run_competition_mode()
+        finally:
+            setup.cancel()
+            
+    def _setup_gaia(self):
+        with timer.phase("GAIA node probes", background=True):
+            gaia_models = self.gaia_node.setup_gaia_models()
+        if not gaia_models:
+            print("⚠️  No GAIA models available - get API key from https://gaianet.ai/")
+            
+    def _setup_wallet(self):
+        with timer.phase("Lit PKP wallet", background=True):
+            self.lit_agent.create_pkp_wallet()
+            
+    def _setup_models(self):
+        """Warm start stat-arb models from the model store, fitting only what's missing"""
+        with timer.phase("ML models", background=True):
+            price_data = self.bars.price_frame()
+            statuses = self.strategy.warm_start(price_data, config.MODEL_LABEL_HORIZON, config.MODEL_MIN_BARS)
+        if not statuses:
+            print("⚠️  Not enough price history to train stat-arb models yet")
+        for pair, status in statuses.items():
+            print(f"🧠 Model {pair}: {status}")
 
 if __name__ == "__main__":
     bot = AutonomousApesBot()
@@ -0,0 +1,145 @@
+# metrics_feed.py - Incremental performance metrics published to the dashboard
+import hashlib
+import json
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+DEFAULT_METRICS = {
+    "total_return": 0,
+    "sharpe_ratio": 0,
+    "max_drawdown": 0,
+    "winning_trades": 0,
+    "total_trades": 0
+}
+
+
+class MetricsHub:
+    def __init__(self):
+        """Latest metrics snapshot, pre-serialized once per update.
+        
+        Readers (HTTP requests, SSE streams) only copy a reference to the
+        encoded body, so the number of dashboard tabs doesn't add work on
+        the trading side.
+        """
+        self.condition = threading.Condition()
+        self.version = 0
+        self._set(dict(DEFAULT_METRICS))
+        
+    def _set(self, snapshot: Dict):
+        body = json.dumps(snapshot, separators=(",", ":")).encode()
+        self.snapshot = snapshot
+        self.body = body
+        self.etag = f"{self.version}-{hashlib.sha1(body).hexdigest()[:12]}"
+        
+    def publish(self, snapshot: Dict):
+        with self.condition:
+            self.version += 1
+            self._set(snapshot)
+            self.condition.notify_all()
+            
+    def current(self) -> Tuple[int, bytes, str]:
+        with self.condition:
+            return self.version, self.body, self.etag
+    
+    def wait(self, since_version: int, timeout: float) -> Tuple[int, bytes, str]:
+        """Block until a snapshot newer than `since_version` exists (or timeout)"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.version > since_version, timeout=timeout)
+            return self.version, self.body, self.etag
+
+
+# Shared by the bot and the dashboard when they run in one process
+hub = MetricsHub()
+
+
+class PerformanceTracker:
+    def __init__(self, hub: MetricsHub = hub, ledger=None):
+        """Running total_return / sharpe / drawdown from equity updates.
+        
+        Every statistic is updated in O(1) per sample (Welford for the
+        return mean/variance), then published to the hub. Updates arrive
+        from the loop and from order threads, so they are serialized.
+        """
+        self.hub = hub
+        self.lock = threading.RLock()
+        self.ledger = ledger
+        self.sections: Dict[str, Callable[[], Dict]] = {}
+        
+        self.start_value: Optional[float] = None
+        self.last_value: Optional[float] = None
+        self.last_time: Optional[float] = None
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+        
+        # Welford state for per-sample returns and sample spacing
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.elapsed = 0.0
+        
+    def add_section(self, name: str, collect: Callable[[], Dict]):
+        """Include `collect()` under `name` in every published snapshot"""
+        self.sections[name] = collect
+        
+    def on_portfolio(self, snapshot: Dict):
+        """PortfolioCache listener"""
+        value = snapshot.get("totalValue")
+        if value:
+            self.on_equity(value)
+            
+    def on_trade(self, trade: Dict):
+        """TradingEngine trade listener - trade counts come from the ledger"""
+        self.publish()
+        
+    def on_equity(self, value: float, now: Optional[float] = None):
+        with self.lock:
+            now = time.monotonic() if now is None else now
+            if self.start_value is None:
+                self.start_value = self.peak = value
+            else:
+                r = value / self.last_value - 1
+                self.n += 1
+                delta = r - self.mean
+                self.mean += delta / self.n
+                self.m2 += delta * (r - self.mean)
+                self.elapsed += now - self.last_time
+                
+            self.peak = max(self.peak, value)
+            self.max_drawdown = max(self.max_drawdown, 1 - value / self.peak)
+            self.last_value, self.last_time = value, now
+            self.publish()
+        
+    def sharpe_ratio(self) -> float:
+        with self.lock:
+            if self.n < 2 or self.elapsed <= 0:
+                return 0.0
+            std = math.sqrt(self.m2 / (self.n - 1))
+            if std == 0:
+                return 0.0
+            samples_per_year = SECONDS_PER_YEAR / (self.elapsed / self.n)
+            return self.mean / std * math.sqrt(samples_per_year)
+    
+    def metrics(self) -> Dict:
+        metrics = dict(DEFAULT_METRICS)
+        with self.lock:
+            if self.start_value:
+                metrics.update({
+                    "total_return": round((self.last_value / self.start_value - 1) * 100, 2),
+                    "sharpe_ratio": round(self.sharpe_ratio(), 2),
+                    "max_drawdown": round(self.max_drawdown * 100, 2)
+                })
+        if self.ledger is not None:
+            metrics["winning_trades"] = self.ledger.winning_trades
+            metrics["total_trades"] = self.ledger.total_trades
+        for name, collect in self.sections.items():
+            metrics[name] = collect()
+        return metrics
+    
+    def publish(self):
+        # Under the lock so snapshots reach the hub in update order
+        with self.lock:
+            self.hub.publish(self.metrics())
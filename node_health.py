@@ -0,0 +1,134 @@
+# node_health.py - Per-node health tracking, circuit breaking and latency-aware routing
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from instrumentation import metrics
+
+CLOSED = "closed"        # Healthy, receives traffic
+OPEN = "open"            # Tripped, skipped until a probe succeeds
+HALF_OPEN = "half_open"  # Cooldown over, a probe is in flight
+
+
+class NodeHealth:
+    def __init__(self, name: str, window: int = 200):
+        """Rolling stats over the last `window` calls to one node"""
+        self.name = name
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)  # "ok" / "error" / "timeout" / "parse"
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+    
+    def rate(self, kind: str) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for outcome in self.outcomes if outcome == kind) / len(self.outcomes)
+    
+    def snapshot(self) -> Dict:
+        return {
+            "state": self.state,
+            "calls": len(self.outcomes),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "error_rate": 1 - self.rate("ok") if self.outcomes else 0.0,
+            "timeout_rate": self.rate("timeout"),
+            "parse_failure_rate": self.rate("parse")
+        }
+
+
+class NodeRouter:
+    def __init__(self, nodes: Dict[str, str], failure_threshold: int = 3, cooldown: float = 30,
+                 probe: Optional[Callable[[str, str], bool]] = None, probe_interval: float = 5):
+        """Routes requests to the fastest healthy nodes.
+        
+        A node trips OPEN after `failure_threshold` consecutive failures
+        (errors, timeouts or unparseable answers) and gets no traffic. After
+        `cooldown` seconds the background prober moves it to HALF_OPEN and
+        calls `probe(name, endpoint)`; success closes it, failure re-opens it.
+        """
+        self.nodes = dict(nodes)
+        self.health = {name: NodeHealth(name) for name in nodes}
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.probe = probe
+        self.probe_interval = probe_interval
+        self.lock = threading.Lock()
+        self.prober = None
+        
+    def record_success(self, name: str, latency: float):
+        with self.lock:
+            health = self.health[name]
+            health.latencies.append(latency)
+            health.outcomes.append("ok")
+            health.consecutive_failures = 0
+            health.state = CLOSED
+            
+    def record_failure(self, name: str, kind: str = "error", latency: Optional[float] = None):
+        with self.lock:
+            health = self.health[name]
+            if latency is not None:
+                health.latencies.append(latency)
+            health.outcomes.append(kind)
+            health.consecutive_failures += 1
+            metrics.increment("timeouts" if kind == "timeout" else "failures", f"gaia:{name}")
+            if health.state == HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+                self._trip(health)
+                
+    def trip(self, name: str):
+        """Open the breaker right away (e.g. the startup probe failed)"""
+        with self.lock:
+            self._trip(self.health[name])
+            
+    def _trip(self, health: NodeHealth):
+        if health.state != OPEN:
+            print(f"🔌 GAIA node {health.name} circuit open")
+        health.state = OPEN
+        health.opened_at = time.monotonic()
+        
+    def select(self, k: Optional[int] = None) -> List[Tuple[str, str]]:
+        """Healthy nodes, fastest (median latency) first; untried nodes go first"""
+        with self.lock:
+            healthy = [h for h in self.health.values() if h.state == CLOSED]
+            healthy.sort(key=lambda h: h.percentile(50) or 0.0)
+            return [(h.name, self.nodes[h.name]) for h in healthy[:k]]
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        with self.lock:
+            return {name: health.snapshot() for name, health in self.health.items()}
+    
+    def start_probing(self):
+        """Background half-open probing of tripped nodes (idempotent)"""
+        if self.prober or not self.probe:
+            return
+        self.prober = threading.Thread(target=self._probe_loop, name="gaia-prober", daemon=True)
+        self.prober.start()
+        
+    def _probe_loop(self):
+        while True:
+            time.sleep(self.probe_interval)
+            now = time.monotonic()
+            with self.lock:
+                due = [h for h in self.health.values() if h.state == OPEN and now - h.opened_at >= self.cooldown]
+                for health in due:
+                    health.state = HALF_OPEN
+                    
+            for health in due:
+                started = time.monotonic()
+                try:
+                    ok = self.probe(health.name, self.nodes[health.name])
+                except Exception:
+                    ok = False
+                if ok:
+                    print(f"🔌 GAIA node {health.name} recovered")
+                    self.record_success(health.name, time.monotonic() - started)
+                else:
+                    self.record_failure(health.name, "error")
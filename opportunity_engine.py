@@ -0,0 +1,208 @@
+# opportunity_engine.py - Merge, dedupe, score and rank opportunities from every source
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import config
+from instrumentation import metrics
+
+ACTIONS = ("buy", "sell")
+ARBITRAGE = "arbitrage"  # Hedged multi-leg opportunity - its legs trade together or not at all
+
+
+class Opportunity:
+    __slots__ = ("pair", "action", "confidence", "expected_profit", "risk", "source", "reason", "chain", "score",
+                 "legs")
+    
+    def __init__(self, pair: str, action: str, confidence: float, expected_profit: float,
+                 risk: float = 0.0, source: str = "", reason: str = "", chain: str = "eth",
+                 legs: Tuple["Opportunity", ...] = ()):
+        """One trade, or with `legs` a hedged unit that is ranked, sized and submitted as one"""
+        self.pair = pair
+        self.action = action
+        self.confidence = confidence
+        self.expected_profit = expected_profit
+        self.risk = risk
+        self.source = source
+        self.reason = reason
+        self.chain = chain
+        self.legs = legs
+        self.score = 0.0
+        
+    @classmethod
+    def from_dict(cls, data: Dict, source: str = "") -> Optional["Opportunity"]:
+        """Opportunity from a signal dict, or None if it isn't actionable"""
+        try:
+            pair = str(data["pair"]).strip().upper()
+            action = str(data["action"]).strip().lower()
+            opp = cls(pair, action, float(data.get("confidence", 0)), float(data.get("expected_profit", 0)),
+                      float(data.get("risk", 0)), data.get("source", source), data.get("reason", ""),
+                      data.get("chain", "eth"))
+        except (KeyError, TypeError, ValueError):
+            return None
+        return opp if action in ACTIONS and pair.count("/") == 1 else None
+    
+    @property
+    def key(self):
+        return self.pair, self.action, self.chain
+    
+    def to_dict(self) -> Dict:
+        """Plain dict in the shape the order builder and sizing code expect"""
+        opp = {
+            "pair": self.pair,
+            "action": self.action,
+            "confidence": self.confidence,
+            "expected_profit": self.expected_profit,
+            "risk": self.risk,
+            "source": self.source,
+            "chain": self.chain,
+            "score": self.score
+        }
+        if self.reason:
+            opp["reason"] = self.reason
+        if self.legs:
+            opp["legs"] = [leg.to_dict() for leg in self.legs]
+        return opp
+    
+    def __repr__(self):
+        return f"Opportunity({self.action} {self.pair}, profit={self.expected_profit:.2f}, score={self.score:.2f}, source={self.source})"
+
+
+def risk_adjusted_profit(opp: Opportunity, risk_aversion: float = config.OPPORTUNITY_RISK_AVERSION) -> float:
+    """Default score: expected profit weighted by confidence, discounted by risk"""
+    return opp.expected_profit * opp.confidence * max(0.0, 1.0 - risk_aversion * opp.risk)
+
+
+class TopK:
+    def __init__(self, k: int):
+        """Best `k` opportunities by score, one per (pair, action, chain).
+        
+        A min-heap of live entries keeps the current floor at heap[0], so a
+        candidate that can't make the cut is rejected in O(1) and an
+        accepted one costs O(log k). Replaced duplicates are marked dead and
+        skipped lazily instead of being removed from the middle of the heap.
+        """
+        self.k = k
+        self.heap = []  # [score, seq, opp or None]
+        self.entries = {}  # (pair, action, chain) -> heap entry
+        self.seq = itertools.count()
+        
+    def offer(self, opp: Opportunity) -> bool:
+        current = self.entries.get(opp.key)
+        if current is not None:
+            if current[0] >= opp.score:
+                return False
+            current[2] = None  # Superseded by the better duplicate
+        elif len(self.entries) >= self.k and opp.score <= self.floor():
+            return False
+        
+        entry = [opp.score, next(self.seq), opp]
+        self.entries[opp.key] = entry
+        heapq.heappush(self.heap, entry)
+        if len(self.entries) > self.k:
+            self._pop_min()
+        return True
+    
+    def floor(self) -> float:
+        while self.heap[0][2] is None:
+            heapq.heappop(self.heap)
+        return self.heap[0][0]
+    
+    def _pop_min(self):
+        while True:
+            _, _, opp = heapq.heappop(self.heap)
+            if opp is not None:
+                del self.entries[opp.key]
+                return
+            
+    def items(self) -> List[Opportunity]:
+        """Live opportunities, best first"""
+        return [entry[2] for entry in sorted(self.entries.values(), reverse=True)]
+    
+    def __len__(self):
+        return len(self.entries)
+
+
+Producer = Callable[[], Awaitable[Iterable]]
+
+
+class OpportunityEngine:
+    def __init__(self, score: Callable[[Opportunity], float] = risk_adjusted_profit,
+                 top_k: int = config.OPPORTUNITY_TOP_K, min_profit: float = config.OPPORTUNITY_MIN_PROFIT,
+                 source_timeout: float = config.OPPORTUNITY_SOURCE_TIMEOUT):
+        """Runs every registered source concurrently each cycle and keeps the top `top_k`.
+        
+        Sources are async callables returning Opportunity objects or signal
+        dicts. Each result is scored and offered to the top-K as soon as its
+        source finishes; anything with expected profit at or below
+        `min_profit`, a non-positive score, or a score under the current
+        K-th best is dropped on the spot. A source that applies its own
+        threshold can register with a `min_profit` of its own instead.
+        """
+        self.score = score
+        self.top_k = top_k
+        self.min_profit = min_profit
+        self.source_timeout = source_timeout
+        self.producers: Dict[str, Producer] = {}
+        self.min_profits: Dict[str, float] = {}
+        self.stats = {"offered": 0, "below_threshold": 0, "not_top_k": 0, "source_errors": 0}
+        self.last_cycle = {}
+        
+    def add_producer(self, name: str, producer: Producer, min_profit: Optional[float] = None):
+        self.producers[name] = producer
+        if min_profit is not None:
+            self.min_profits[name] = min_profit
+        
+    async def collect(self) -> List[Opportunity]:
+        """One selection cycle across all sources - best opportunity first"""
+        top = TopK(self.top_k)
+        started = time.monotonic()
+        timings = await asyncio.gather(*(
+            self._run_producer(name, producer, top) for name, producer in self.producers.items()
+        ))
+        self.last_cycle = {
+            "sources": dict(timings),
+            "selected": len(top),
+            "elapsed": time.monotonic() - started
+        }
+        return top.items()
+    
+    async def collect_dicts(self) -> List[Dict]:
+        return [opp.to_dict() for opp in await self.collect()]
+    
+    async def _run_producer(self, name: str, producer: Producer, top: TopK):
+        started = time.monotonic()
+        try:
+            with metrics.span(f"source.{name}"):
+                results = await asyncio.wait_for(producer(), self.source_timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️  Opportunity source {name} timed out after {self.source_timeout:.0f}s")
+            self.stats["source_errors"] += 1
+            return name, None
+        except Exception as e:
+            print(f"❌ Opportunity source {name} failed: {str(e)}")
+            self.stats["source_errors"] += 1
+            return name, None
+        
+        for item in results or ():
+            self.offer(item, top, name)
+        return name, time.monotonic() - started
+    
+    def offer(self, item, top: TopK, source: str = "") -> bool:
+        opp = item if isinstance(item, Opportunity) else Opportunity.from_dict(item, source)
+        self.stats["offered"] += 1
+        if opp is None or opp.expected_profit <= self.min_profits.get(source, self.min_profit):
+            self.stats["below_threshold"] += 1
+            return False
+        
+        opp.score = self.score(opp)
+        if opp.score <= 0:
+            self.stats["below_threshold"] += 1
+            return False
+        
+        if not top.offer(opp):
+            self.stats["not_top_k"] += 1
+            return False
+        return True
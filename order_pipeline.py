@@ -0,0 +1,187 @@
+# order_pipeline.py - Non-blocking order submission for the asyncio main loop
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import config
+from instrumentation import metrics
+
+
+class OrderPipeline:
+    def __init__(self, engine, max_queue: int = config.ORDER_QUEUE_SIZE,
+                 concurrency: int = config.ORDER_CONCURRENCY,
+                 deadline: float = config.ORDER_DEADLINE,
+                 gate=None, agent_id: str = config.DEFAULT_AGENT_ID):
+        """Bounded order queue drained by `concurrency` workers.
+        
+        An order is a dict with the execute_trade arguments
+        (from_token, to_token, amount, reason, optional chain) plus an optional `deadline`
+        in seconds that overrides the pipeline default. With a PreTradeGate,
+        orders also carry amount_usd (and optionally agent_id, slippage,
+        expected_profit, estimated_risk) and are checked before queueing.
+        """
+        self.engine = engine
+        self.gate = gate
+        self.agent_id = agent_id
+        self.concurrency = concurrency
+        self.deadline = deadline
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        
+        # Blocking execute_trade calls run here, never on the event loop
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="orders")
+        self.workers = []
+        
+        self.stats = {
+            "submitted": 0,
+            "rejected": 0,
+            "blocked": 0,
+            "completed": 0,
+            "failed": 0,
+            "expired": 0,
+            "in_flight": 0
+        }
+        
+    async def start(self):
+        """Spawn the worker tasks (idempotent)"""
+        if self.workers:
+            return
+        self.workers = [
+            asyncio.create_task(self._worker(i), name=f"order-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+    
+    def submit(self, order: Dict, callback: Optional[Callable[[Dict, Dict], None]] = None) -> asyncio.Future:
+        """Queue an order without waiting for it.
+        
+        Returns a future resolving to the execute_trade result dict.
+        `callback(order, result)` is also called on completion if given.
+        A full queue resolves the future immediately with an error.
+        """
+        return self.submit_group([order], callback)[0]
+    
+    def submit_group(self, orders: List[Dict],
+                     callback: Optional[Callable[[Dict, Dict], None]] = None) -> List[asyncio.Future]:
+        """Queue orders that must trade together (hedge legs) - all are admitted or none.
+        
+        The gate reserves every order in one step and the queue must have
+        room for all of them; otherwise each future resolves with the same
+        error and nothing is queued. One future per order, in order.
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for order in orders:
+            future = loop.create_future()
+            if callback:
+                future.add_done_callback(lambda f, order=order: f.cancelled() or callback(order, f.result()))
+            futures.append(future)
+        
+        # Policy checks cost microseconds - rejected orders never hit the network
+        agent_id = orders[0].get("agent_id", self.agent_id) if orders else self.agent_id
+        reserved_at = None
+        error = None
+        if self.gate:
+            reserved_at = time.time()
+            ok, reason = self.gate.reserve_all(agent_id, orders, reserved_at)
+            if not ok:
+                self.stats["blocked"] += len(orders)
+                error = f"pre-trade gate: {reason}"
+        
+        if error is None and self.queue.maxsize and self.queue.maxsize - self.queue.qsize() < len(orders):
+            self.stats["rejected"] += len(orders)
+            for order in orders:
+                self._release(order, reserved_at)
+            error = "order queue full"
+            
+        if error is not None:
+            for future in futures:
+                future.set_result({"success": False, "error": error})
+            return futures
+        
+        for order, future in zip(orders, futures):
+            deadline = order.get("deadline", self.deadline)
+            self.queue.put_nowait((order, future, time.monotonic() + deadline, reserved_at))
+            self.stats["submitted"] += 1
+        return futures
+    
+    def _release(self, order: Dict, reserved_at: Optional[float]):
+        """Return the gate's daily-limit reservation for an order that didn't trade"""
+        if self.gate and reserved_at is not None:
+            self.gate.release(order.get("agent_id", self.agent_id), order, reserved_at)
+    
+    async def _worker(self, worker_id: int):
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            order, future, expires_at, reserved_at = await self.queue.get()
+            try:
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    self.stats["expired"] += 1
+                    result = {"success": False, "error": "deadline exceeded before submission"}
+                else:
+                    result = await self._execute(loop, order, remaining)
+                
+                # A pending order may still fill, so it keeps its reservation
+                if not result.get("success") and not result.get("pending"):
+                    self._release(order, reserved_at)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                self.stats["failed"] += 1
+                self._release(order, reserved_at)
+                if not future.done():
+                    future.set_result({"success": False, "error": str(e)})
+            finally:
+                self.queue.task_done()
+    
+    async def _execute(self, loop, order: Dict, timeout: float) -> Dict:
+        self.stats["in_flight"] += 1
+        started = time.perf_counter()
+        
+        # Whether a thread picked the order up before the deadline - decided
+        # under the lock, so an abandoned order can never start afterwards
+        state = {"started": False, "abandoned": False}
+        lock = threading.Lock()
+        
+        def run():
+            with lock:
+                if state["abandoned"]:
+                    return {"success": False, "error": "deadline exceeded before execution", "timeout": True}
+                state["started"] = True
+            return self.engine.execute_trade(order["from_token"], order["to_token"], order["amount"],
+                                             order["reason"], order.get("chain", "eth"))
+        
+        try:
+            result = await asyncio.wait_for(loop.run_in_executor(self.executor, run), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.stats["expired"] += 1
+            metrics.increment("timeouts", "order.execute")
+            with lock:
+                state["abandoned"] = True
+                if not state["started"]:
+                    # Still waiting for a thread - it will never run, so its reservation goes back
+                    return {"success": False, "error": "deadline exceeded before execution", "timeout": True}
+            # The HTTP call keeps running in its thread - the order may still fill
+            return {"success": False, "error": "deadline exceeded", "pending": True}
+        finally:
+            self.stats["in_flight"] -= 1
+            metrics.observe("phase", "order.execute", time.perf_counter() - started)
+            
+        if result.get("success"):
+            self.stats["completed"] += 1
+        else:
+            self.stats["failed"] += 1
+            metrics.increment("failures", "order.execute")
+        return result
+    
+    async def stop(self, drain: bool = True):
+        """Stop the workers, optionally after the queue has been drained"""
+        if drain:
+            await self.queue.join()
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        self.executor.shutdown(wait=False)
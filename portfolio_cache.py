@@ -0,0 +1,150 @@
+# portfolio_cache.py - Local portfolio state so trade decisions skip the API round trip
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import config
+from instrumentation import span
+from token_registry import registry
+
+
+class PortfolioCache:
+    def __init__(self, engine, ttl: float = config.PORTFOLIO_TTL,
+                 reconcile_interval: float = config.PORTFOLIO_RECONCILE_INTERVAL,
+                 drift_tolerance: float = config.PORTFOLIO_DRIFT_TOLERANCE):
+        """Portfolio seeded from engine.get_portfolio() and updated in place from fills.
+        
+        Snapshots are flat: {symbol: amount, ..., "totalValue": usd}. A
+        snapshot is served from memory until it is `ttl` seconds old; the
+        server is consulted at least every `reconcile_interval` seconds, and
+        immediately after a fill that couldn't be applied locally.
+        """
+        self.engine = engine
+        self.ttl = ttl
+        self.reconcile_interval = reconcile_interval
+        self.drift_tolerance = drift_tolerance
+        
+        self.lock = threading.RLock()
+        self.balances: Dict[str, float] = {}
+        self.prices: Dict[str, float] = {}
+        self.total_value = 0.0
+        self.updated_at = 0.0     # Last change, local or server
+        self.synced_at = 0.0      # Last server sync
+        self.dirty = True         # Local state can't be trusted until reconciled
+        
+        self.stats = {"hits": 0, "refreshes": 0, "local_updates": 0, "drift_events": 0}
+        self.listeners: List[Callable[[Dict], None]] = []
+        
+        engine.trade_listeners.append(self.apply_trade)
+        
+    def get(self, max_age: Optional[float] = None) -> Dict:
+        """Current portfolio, refetched only when stale or due for reconciliation"""
+        max_age = self.ttl if max_age is None else max_age
+        now = time.monotonic()
+        with self.lock:
+            fresh = (
+                not self.dirty
+                and now - self.updated_at <= max_age
+                and now - self.synced_at <= self.reconcile_interval
+            )
+            if fresh:
+                self.stats["hits"] += 1
+                return self.snapshot()
+        return self.refresh()
+    
+    def refresh(self) -> Dict:
+        """Reconcile against the server (one get_portfolio round trip)"""
+        with span("portfolio.fetch"):
+            data = self.engine.get_portfolio()
+        now = time.monotonic()
+        with self.lock:
+            self.stats["refreshes"] += 1
+            if not data:
+                # Keep serving the last known state; retry after ttl
+                self.updated_at = now
+                return self.snapshot()
+            
+            balances, prices, total_value = _parse_portfolio(data)
+            if self.balances and not self.dirty and self.total_value:
+                drift = abs(total_value - self.total_value) / self.total_value
+                if drift > self.drift_tolerance:
+                    self.stats["drift_events"] += 1
+                    print(f"⚠️  Portfolio drift {drift:.2%}: local ${self.total_value:,.2f} vs server ${total_value:,.2f}")
+            
+            self.balances, self.total_value = balances, total_value
+            self.prices.update(prices)
+            self.updated_at = self.synced_at = now
+            self.dirty = False
+            snapshot = self.snapshot()
+        
+        self._publish(snapshot)
+        return snapshot
+    
+    def apply_trade(self, trade: Dict):
+        """Engine trade listener: move balances using the fill amounts"""
+        result = trade.get("result") or {}
+        tx = result.get("transaction", result)
+        from_token = _symbol(trade["from"])
+        to_token = _symbol(trade["to"])
+        from_amount = float(tx.get("fromAmount", trade["amount"]))
+        to_amount = tx.get("toAmount")
+        
+        with self.lock:
+            if to_amount is None or self.dirty:
+                # Can't tell what we received - ask the server on next read
+                self.dirty = True
+                return
+            
+            self.balances[from_token] = self.balances.get(from_token, 0) - from_amount
+            self.balances[to_token] = self.balances.get(to_token, 0) + float(to_amount)
+            if all(token in self.prices for token in self.balances):
+                self.total_value = sum(amount * self.prices[token] for token, amount in self.balances.items())
+            
+            self.updated_at = time.monotonic()
+            self.stats["local_updates"] += 1
+            snapshot = self.snapshot()
+        
+        self._publish(snapshot)
+    
+    def snapshot(self) -> Dict:
+        portfolio = dict(self.balances)
+        portfolio["totalValue"] = self.total_value
+        return portfolio
+    
+    def subscribe(self, listener: Callable[[Dict], None]):
+        """Call `listener(snapshot)` after every refresh or local update"""
+        self.listeners.append(listener)
+    
+    def bind_risk_manager(self, risk_manager):
+        """Keep RiskManager.current_capital equal to the cached totalValue"""
+        def follow(snapshot: Dict):
+            if snapshot["totalValue"]:
+                risk_manager.current_capital = snapshot["totalValue"]
+        self.subscribe(follow)
+        
+    def _publish(self, snapshot: Dict):
+        for listener in self.listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                print(f"⚠️  Portfolio listener failed: {str(e)}")
+
+
+def _symbol(token: str) -> str:
+    return registry.symbol(token)
+
+
+def _parse_portfolio(data: Dict):
+    """Accepts the API's {"tokens": [...]} shape or the flat {symbol: amount} fallback"""
+    balances, prices = {}, {}
+    if isinstance(data.get("tokens"), list):
+        for entry in data["tokens"]:
+            symbol = entry.get("symbol") or _symbol(entry.get("token", ""))
+            balances[symbol] = balances.get(symbol, 0) + float(entry.get("amount", 0))
+            if entry.get("price") is not None:
+                prices[symbol] = float(entry["price"])
+    else:
+        for key, value in data.items():
+            if key != "totalValue" and isinstance(value, (int, float)):
+                balances[_symbol(key)] = float(value)
+    return balances, prices, float(data.get("totalValue", 0))
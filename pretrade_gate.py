@@ -0,0 +1,139 @@
+# pretrade_gate.py - Local pre-trade policy checks, run before any network call
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import config
+from token_registry import registry
+
+
+class RollingSpend:
+    def __init__(self, window: float = 24 * 3600, bucket: float = 300):
+        """USD spent over the last `window` seconds, held in `bucket`-second slots.
+        
+        The running total is adjusted as slots expire, so reading it never
+        scans past trades; an update touches at most the slots that expired
+        since the previous one.
+        """
+        self.bucket = bucket
+        self.slots = [0.0] * int(window // bucket)
+        self.head = None  # Absolute bucket number of the newest slot
+        self.total = 0.0
+        
+    def _advance(self, now: float):
+        current = int(now // self.bucket)
+        if self.head is None:
+            self.head = current
+            return
+        expired = min(current - self.head, len(self.slots))
+        for k in range(1, expired + 1):
+            slot = (self.head + k) % len(self.slots)
+            self.total -= self.slots[slot]
+            self.slots[slot] = 0.0
+        self.head = max(self.head, current)
+        
+    def spent(self, now: float) -> float:
+        self._advance(now)
+        return self.total
+    
+    def add(self, now: float, amount: float):
+        """Record spend at `now` (negative amounts refund it while still in the window)"""
+        self._advance(now)
+        bucket = int(now // self.bucket)
+        if self.head - bucket >= len(self.slots):
+            return  # Already outside the window
+        self.slots[bucket % len(self.slots)] += amount
+        self.total += amount
+
+
+class PreTradeGate:
+    def __init__(self, permissions: Dict = config.AGENT_PERMISSIONS,
+                 multisig_threshold: float = config.MULTISIG_THRESHOLD_USD,
+                 max_risk: float = config.MAX_TRADE_RISK):
+        """Enforces the Lit permission policy locally, mirroring create_permission_system.
+        
+        A trade is a dict with amount_usd, from_token and to_token (symbols
+        or addresses) and optionally action, slippage, expected_profit,
+        estimated_risk and signatures.
+        """
+        self.permissions = permissions
+        self.multisig_threshold = multisig_threshold
+        self.max_risk = max_risk
+        self.spend: Dict[str, RollingSpend] = {}
+        self.lock = threading.Lock()
+        
+    def policy(self, agent_id: str) -> Dict:
+        return self.permissions["sub_agents"].get(agent_id) or self.permissions["master_agent"]
+    
+    def check(self, agent_id: str, trade: Dict, now: Optional[float] = None) -> Tuple[bool, str]:
+        """(ok, reason) without recording any spend"""
+        now = time.time() if now is None else now
+        policy = self.policy(agent_id)
+        amount = float(trade.get("amount_usd", 0))
+        
+        if trade.get("estimated_risk", 0) > self.max_risk and not policy.get("override_limits"):
+            return False, f"risk too high ({trade['estimated_risk']})"
+        
+        if policy.get("requires_profit") and trade.get("expected_profit", 0) < 0:
+            return False, "trade must be profitable"
+        
+        allowed_actions = policy.get("allowed_actions")
+        if allowed_actions and trade.get("action") not in allowed_actions:
+            return False, f"action {trade.get('action')} not allowed for {agent_id}"
+        
+        allowed_tokens = policy.get("allowed_tokens")
+        if allowed_tokens:
+            for token in (trade.get("from_token", ""), trade.get("to_token", "")):
+                symbol = registry.symbol(token)
+                if symbol not in allowed_tokens:
+                    return False, f"token {symbol} not allowed for {agent_id}"
+        
+        max_slippage = policy.get("max_slippage")
+        if max_slippage is not None and trade.get("slippage", 0) > max_slippage:
+            return False, f"slippage {trade['slippage']} above {max_slippage}"
+        
+        daily_limit = policy.get("daily_limit_usd")
+        if daily_limit is not None:
+            spent = self._spend(agent_id).spent(now)
+            if spent + amount > daily_limit:
+                return False, f"daily limit exceeded (${spent:,.0f} + ${amount:,.0f} > ${daily_limit:,.0f})"
+        
+        if amount > self.multisig_threshold and trade.get("signatures", 1) < 2:
+            return False, "requires 2 signatures for large trades"
+        
+        return True, "ok"
+    
+    def reserve(self, agent_id: str, trade: Dict, now: Optional[float] = None) -> Tuple[bool, str]:
+        """Check and, if allowed, count the trade against the daily limit atomically"""
+        now = time.time() if now is None else now
+        with self.lock:
+            ok, reason = self.check(agent_id, trade, now)
+            if ok:
+                self._spend(agent_id).add(now, float(trade.get("amount_usd", 0)))
+            return ok, reason
+    
+    def reserve_all(self, agent_id: str, trades: List[Dict], now: Optional[float] = None) -> Tuple[bool, str]:
+        """Reserve trades that must execute together (hedge legs): all of them or none"""
+        now = time.time() if now is None else now
+        with self.lock:
+            reserved = []
+            for trade in trades:
+                ok, reason = self.check(agent_id, trade, now)
+                if not ok:
+                    for done in reserved:
+                        self._spend(agent_id).add(now, -float(done.get("amount_usd", 0)))
+                    return False, reason
+                self._spend(agent_id).add(now, float(trade.get("amount_usd", 0)))
+                reserved.append(trade)
+            return True, "ok"
+    
+    def release(self, agent_id: str, trade: Dict, reserved_at: float):
+        """Give back a reservation for a trade that didn't execute"""
+        with self.lock:
+            self._spend(agent_id).add(reserved_at, -float(trade.get("amount_usd", 0)))
+    
+    def _spend(self, agent_id: str) -> RollingSpend:
+        spend = self.spend.get(agent_id)
+        if spend is None:
+            spend = self.spend[agent_id] = RollingSpend()
+        return spend
@@ -0,0 +1,137 @@
+# price_feed.py - Batched multi-token price poller publishing immutable snapshots
+import asyncio
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import config
+from transport import get_transport
+
+
+class PriceSnapshot(NamedTuple):
+    ts: int                         # Poll time, unix milliseconds
+    prices: Mapping[str, float]     # Read-only symbol -> USD price
+    updated: Mapping[str, int]      # Read-only symbol -> source update time, unix ms
+    changed: Tuple[str, ...]        # Symbols with a new bar in this poll
+
+
+EMPTY_SNAPSHOT = PriceSnapshot(0, MappingProxyType({}), MappingProxyType({}), ())
+
+
+class PriceFeed:
+    def __init__(self, tokens: Dict[str, str] = config.TOKENS, url: str = config.PRICE_FEED_URL,
+                 platform: str = config.PRICE_FEED_PLATFORM, batch_size: int = config.PRICE_FEED_BATCH_SIZE,
+                 interval: float = config.PRICE_FEED_INTERVAL, timeout: float = config.PRICE_FEED_TIMEOUT,
+                 api_key: Optional[str] = config.PRICE_FEED_API_KEY):
+        """Polls USD prices for every token in `tokens` ({symbol: address}).
+        
+        Addresses are split into batches of `batch_size` and each batch is
+        one token_price request, all sent concurrently - a poll costs
+        ceil(tokens / batch_size) requests however many tokens are tracked.
+        
+        Each poll publishes a new PriceSnapshot by swapping one reference,
+        so readers just take `feed.snapshot` without locking and always see
+        a complete, consistent set of prices.
+        """
+        self.symbols = {address.lower(): symbol for symbol, address in tokens.items()}
+        addresses = list(self.symbols)
+        self.batches = [addresses[i:i + batch_size] for i in range(0, len(addresses), batch_size)]
+        self.url = url.format(platform=platform)
+        self.interval = interval
+        self.timeout = timeout
+        self.headers = {"x-cg-demo-api-key": api_key} if api_key else {}
+        self.http = get_transport()
+        
+        self.snapshot = EMPTY_SNAPSHOT
+        self.subscribers: List[Callable[[PriceSnapshot], None]] = []
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {"polls": 0, "requests": 0, "errors": 0, "bars": 0}
+        
+    def subscribe(self, callback: Callable[[PriceSnapshot], None]):
+        """callback(snapshot) runs after every poll that produced new bars"""
+        self.subscribers.append(callback)
+        
+    def start(self) -> asyncio.Task:
+        """Poll on the feed's own schedule until stop()"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run(), name="price-feed")
+        return self.task
+    
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+            
+    async def run(self):
+        while True:
+            started = time.monotonic()
+            try:
+                await self.poll_once()
+            except Exception as e:
+                print(f"❌ Price feed error: {str(e)}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+            
+    async def poll_once(self) -> PriceSnapshot:
+        """Fetch every batch concurrently, publish and return the new snapshot"""
+        results = await asyncio.gather(*(self._fetch_batch(batch) for batch in self.batches),
+                                       return_exceptions=True)
+        quotes = {}
+        for result in results:
+            if isinstance(result, Exception):
+                self.stats["errors"] += 1
+                print(f"⚠️  Price batch failed: {str(result)}")
+            else:
+                quotes.update(result)
+        self.stats["polls"] += 1
+        return self._publish(quotes)
+    
+    async def _fetch_batch(self, addresses: List[str]) -> Dict[str, Tuple[float, Optional[int]]]:
+        self.stats["requests"] += 1
+        response = await self.http.aget(
+            self.url,
+            params={
+                "contract_addresses": ",".join(addresses),
+                "vs_currencies": "usd",
+                "include_last_updated_at": "true"
+            },
+            headers=self.headers,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        
+        quotes = {}
+        for address, quote in response.json().items():
+            symbol = self.symbols.get(address.lower())
+            if symbol and quote.get("usd") is not None:
+                updated = quote.get("last_updated_at")
+                quotes[symbol] = (float(quote["usd"]), int(updated) * 1000 if updated else None)
+        return quotes
+    
+    def _publish(self, quotes: Dict[str, Tuple[float, Optional[int]]]) -> PriceSnapshot:
+        previous = self.snapshot
+        now = int(time.time() * 1000)
+        prices, updated = dict(previous.prices), dict(previous.updated)
+        
+        changed = []
+        for symbol, (price, source_ts) in quotes.items():
+            ts = source_ts or now
+            if ts <= updated.get(symbol, -1):
+                continue  # Source hasn't moved since the last poll - not a new bar
+            prices[symbol], updated[symbol] = price, ts
+            changed.append(symbol)
+            
+        snapshot = PriceSnapshot(now, MappingProxyType(prices), MappingProxyType(updated), tuple(changed))
+        self.snapshot = snapshot
+        
+        if changed:
+            self.stats["bars"] += len(changed)
+            for callback in self.subscribers:
+                try:
+                    callback(snapshot)
+                except Exception as e:
+                    print(f"❌ Price subscriber {getattr(callback, '__name__', callback)} failed: {str(e)}")
+        return snapshot
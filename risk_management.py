@@ -1,6 +1,8 @@
 # risk_management.py
+import threading
+
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 
 class RiskManager:
     def __init__(self, initial_capital: float = 10000):
@@ -8,7 +10,25 @@ class RiskManager:
         self.current_capital = initial_capital
         self.max_drawdown_threshold = 0.15
         self.daily_loss_limit = 0.03
-        self.position_limits = {}
+        self.position_limits = {}  # token -> max USD exposure
+        
+        # Portfolio-level limits
+        self.max_concentration = 0.25   # Max share of capital in one token
+        self.max_var = 0.02             # Max 1-period VaR as share of capital
+        self.var_z = 1.645              # 95% one-sided
+        self.ewma_lambda = 0.94         # RiskMetrics decay
+        
+        # Portfolio state, one slot per token seen so far
+        self.tokens: List[str] = []
+        self.token_index: Dict[str, int] = {}
+        self.cov = np.zeros((0, 0))         # EWMA covariance of log returns
+        self.last_prices = np.zeros(0)
+        self.positions = np.zeros(0)        # Signed USD exposure
+        
+        # Positions arrive from order threads, prices and sizing from the event
+        # loop - the arrays are resized and refilled in place, so all access is
+        # serialized
+        self.lock = threading.RLock()
         
     def calculate_kelly_criterion(self, win_rate: float, avg_win: float, avg_loss: float) -> float:
         """Calculate optimal position size using Kelly Criterion"""
@@ -38,6 +58,109 @@ class RiskManager:
         
         return min(position_size, self.current_capital * 0.05)  # Max 5% per trade
     
+    def _slots(self, tokens: Sequence[str]) -> np.ndarray:
+        """Index of each token in the portfolio arrays, growing them for new tokens"""
+        new = [token for token in dict.fromkeys(tokens) if token not in self.token_index]
+        if new:
+            n_old, n_new = len(self.tokens), len(self.tokens) + len(new)
+            cov = np.zeros((n_new, n_new))
+            cov[:n_old, :n_old] = self.cov
+            self.cov = cov
+            self.last_prices = np.concatenate([self.last_prices, np.full(len(new), np.nan)])
+            self.positions = np.concatenate([self.positions, np.zeros(len(new))])
+            for token in new:
+                self.token_index[token] = len(self.tokens)
+                self.tokens.append(token)
+        return np.fromiter((self.token_index[token] for token in tokens), dtype=np.intp, count=len(tokens))
+    
+    def update_prices(self, prices: Dict[str, float]):
+        """EWMA covariance update from one bar of prices (tokens not in `prices` are untouched)"""
+        with self.lock:
+            idx = self._slots(list(prices))
+            new_prices = np.fromiter(prices.values(), dtype=float, count=len(prices))
+            old_prices = self.last_prices[idx]
+            self.last_prices[idx] = new_prices
+            
+            seen = ~np.isnan(old_prices)
+            if not seen.any():
+                return
+            idx, returns = idx[seen], np.log(new_prices[seen] / old_prices[seen])
+            
+            block = np.ix_(idx, idx)
+            lam = self.ewma_lambda
+            self.cov[block] = lam * self.cov[block] + (1 - lam) * np.outer(returns, returns)
+        
+    def set_positions(self, positions: Dict[str, float]):
+        """Replace current exposures with {token: signed USD value}"""
+        with self.lock:
+            self.positions[:] = 0
+            if positions:
+                idx = self._slots(list(positions))
+                self.positions[idx] = np.fromiter(positions.values(), dtype=float, count=len(positions))
+            
+    def portfolio_var(self, exposures: Optional[np.ndarray] = None) -> float:
+        """1-period parametric VaR in USD"""
+        with self.lock:
+            w = self.positions if exposures is None else exposures
+            return float(self.var_z * np.sqrt(max(w @ self.cov @ w, 0.0)))
+    
+    def size_batch(self, tokens: Sequence[str], signal_strengths: Sequence[float],
+                   volatilities: Optional[Sequence[float]] = None,
+                   sides: Optional[Sequence[float]] = None) -> np.ndarray:
+        """Size a batch of candidate trades at once.
+        
+        Applies calculate_position_size to every candidate, then shrinks the
+        batch to respect per-token limits, concentration and portfolio VaR.
+        `sides` is +1 (buy) / -1 (sell) per candidate, default all buys.
+        Returns USD sizes (>= 0) in candidate order.
+        """
+        with self.lock:
+            idx = self._slots(list(tokens))
+            strength = np.minimum(np.asarray(signal_strengths, dtype=float), 1.5)
+            if volatilities is None:
+                volatilities = np.sqrt(np.maximum(np.diag(self.cov)[idx], 0))
+            side = np.ones(len(idx)) if sides is None else np.asarray(sides, dtype=float)
+            
+            # Same formula as calculate_position_size, vectorized
+            base_size = self.current_capital * 0.02
+            sizes = base_size * strength / (1 + np.asarray(volatilities, dtype=float))
+            sizes = np.clip(sizes, 0, self.current_capital * 0.05)
+            
+            # Per-token caps: exposure after all candidates on a token stays within
+            # min(position limit, concentration limit)
+            n = len(self.tokens)
+            limits = np.full(n, self.max_concentration * self.current_capital)
+            for token, limit in self.position_limits.items():
+                if token in self.token_index:
+                    slot = self.token_index[token]
+                    limits[slot] = min(limits[slot], limit)
+            
+            # Trades that shrink |exposure| always go through - down to zero and out
+            # to the limit on the other side - so an over-limit token can be unwound
+            added = np.bincount(idx, weights=sizes * side, minlength=n)
+            after = np.abs(self.positions + added)
+            reducing = self.positions * added < 0
+            headroom = np.where(reducing, np.abs(self.positions) + limits,
+                                np.maximum(limits - np.abs(self.positions), 0))
+            over = (after > limits) & (np.abs(added) > 0)
+            scale = np.ones(n)
+            scale[over] = np.minimum(headroom[over] / np.abs(added[over]), 1)
+            sizes = sizes * scale[idx]
+            
+            # Portfolio VaR: find the largest s in [0, 1] with VaR(p + s*c) <= limit.
+            # A batch that lowers VaR (a + 2b <= 0) is never shrunk, even above the limit
+            c = np.bincount(idx, weights=sizes * side, minlength=n)
+            p = self.positions
+            cov_c = self.cov @ c
+            a, b, c0 = c @ cov_c, p @ cov_c, p @ self.cov @ p
+            limit = (self.max_var * self.current_capital / self.var_z) ** 2
+            if a > 0 and a + 2 * b > 0 and a + 2 * b + c0 > limit:
+                disc = b * b - a * (c0 - limit)
+                s = (-b + np.sqrt(disc)) / a if disc >= 0 else 0.0
+                sizes = sizes * float(np.clip(s, 0, 1))
+            
+            return sizes
+    
     def check_risk_limits(self, current_pnl: float) -> Dict[str, bool]:
         """Multi-layer risk checking"""
         checks = {
@@ -50,5 +173,6 @@ class RiskManager:
     
     def _check_position_concentration(self) -> bool:
         """Ensure no single position is too large"""
-        # Implementation depends on portfolio structure
-        return True
\ No newline at end of file
+        if not len(self.positions) or self.current_capital <= 0:
+            return True
+        return float(np.abs(self.positions).max()) <= self.max_concentration * self.current_capital
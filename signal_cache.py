@@ -0,0 +1,108 @@
+# signal_cache.py - TTL/LRU cache with request coalescing for GAIA signals
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+import config
+
+
+def fingerprint(market_data: Dict, precision: int = config.SIGNAL_CACHE_PRECISION) -> str:
+    """Canonical form of market_data: sorted keys, numbers cut to `precision` significant digits.
+    
+    2001.3 and 2004.9 both become 2.0e3 at 3 digits, so small ticks hit the cache.
+    """
+    def canonical(value):
+        if isinstance(value, bool) or value is None:
+            return value
+        if isinstance(value, (int, float)):
+            return float(f"{value:.{precision}g}")
+        if isinstance(value, dict):
+            return {str(k): canonical(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [canonical(v) for v in value]
+        return str(value)
+    
+    return json.dumps(canonical(market_data), sort_keys=True, separators=(",", ":"))
+
+
+class SignalCache:
+    def __init__(self, ttl: float = config.SIGNAL_CACHE_TTL, max_entries: int = config.SIGNAL_CACHE_SIZE,
+                 precision: int = config.SIGNAL_CACHE_PRECISION):
+        """Caches each model's answer per market fingerprint.
+        
+        Concurrent callers asking for the same (model, fingerprint) share
+        one in-flight call. Failed calls (None or exceptions) aren't cached.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.precision = precision
+        self.entries = OrderedDict()  # key -> (value, expires_at, latency)
+        self.inflight: Dict[tuple, Future] = {}
+        self.lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.latency_saved = 0.0
+        
+    def get_or_call(self, model: str, market_data: Dict, fetch: Callable[[], Any]) -> Any:
+        key = (model, fingerprint(market_data, self.precision))
+        
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                self.latency_saved += entry[2]
+                return copy.deepcopy(entry[0])
+            
+            leader = self.inflight.get(key)
+            if leader is None:
+                future = self.inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+                
+        if leader is not None:
+            # Someone is already asking this model the same question
+            joined = time.monotonic()
+            value, latency = leader.result()
+            with self.lock:
+                self.latency_saved += max(0.0, latency - (time.monotonic() - joined))
+            return copy.deepcopy(value)
+        
+        started = time.monotonic()
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self.lock:
+                self.inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        latency = time.monotonic() - started
+        
+        with self.lock:
+            self.inflight.pop(key, None)
+            if value is not None:
+                self.entries[key] = (value, time.monotonic() + self.ttl, latency)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        future.set_result((value, latency))
+        return copy.deepcopy(value)
+    
+    def metrics(self) -> Dict:
+        with self.lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+                "latency_saved_s": round(self.latency_saved, 3),
+                "entries": len(self.entries)
+            }
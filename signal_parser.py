@@ -0,0 +1,144 @@
+# signal_parser.py - Tolerant, incremental extraction of the signal array from LLM output
+import json
+from typing import Dict, List, Optional
+
+ACTIONS = {"buy", "sell", "hold"}
+
+
+class SignalArrayParser:
+    def __init__(self):
+        """Finds the first valid JSON array in text that arrives in chunks.
+        
+        Prose, markdown and code fences around the array are skipped.
+        feed() returns the parsed array as soon as its closing bracket
+        arrives, so the caller can stop reading the stream right there.
+        """
+        self.text = ""
+        self.pos = 0          # Next character to scan
+        self.start = None     # Index of the '[' that opened the candidate
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.result = None
+        
+    def feed(self, chunk: str) -> Optional[list]:
+        if self.result is not None:
+            return self.result
+        self.text += chunk
+        
+        while self.pos < len(self.text):
+            char = self.text[self.pos]
+            self.pos += 1
+            
+            if self.start is None:
+                if char == "[":
+                    self.start, self.depth = self.pos - 1, 1
+                continue
+            
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "[{":
+                self.depth += 1
+            elif char in "]}":
+                self.depth -= 1
+                if self.depth == 0:
+                    candidate = self.text[self.start:self.pos]
+                    try:
+                        value = json.loads(candidate)
+                    except ValueError:
+                        value = None
+                    if isinstance(value, list):
+                        self.result = value
+                        return value
+                    # Not JSON (e.g. "[note]" in prose) - rescan after that bracket
+                    self.pos, self.start = self.start + 1, None
+                    self.in_string = self.escaped = False
+        return None
+
+
+def validate_opportunity(item) -> Optional[Dict]:
+    """Normalized opportunity, or None if it doesn't match the schema.
+    
+    Required: pair ("BASE/QUOTE"), action (buy/sell/hold), confidence in
+    [0, 1] and expected_profit (USD). reason is optional.
+    """
+    if not isinstance(item, dict):
+        return None
+    try:
+        pair = str(item["pair"]).strip().upper()
+        action = str(item["action"]).strip().lower()
+        confidence = float(item["confidence"])
+        expected_profit = float(item["expected_profit"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    
+    if pair.count("/") != 1 or action not in ACTIONS or not 0 <= confidence <= 1:
+        return None
+    
+    opportunity = {
+        "pair": pair,
+        "action": action,
+        "confidence": confidence,
+        "expected_profit": expected_profit
+    }
+    if item.get("reason"):
+        opportunity["reason"] = str(item["reason"])
+    return opportunity
+
+
+def validate_opportunities(items: list) -> List[Dict]:
+    return [opp for opp in map(validate_opportunity, items) if opp is not None]
+
+
+def parse_signals(text: str) -> Optional[List[Dict]]:
+    """One-shot version for non-streamed completions. None if no array was found."""
+    array = SignalArrayParser().feed(text)
+    return None if array is None else validate_opportunities(array)
+
+
+def consensus(answers: List[List[Dict]]) -> List[Dict]:
+    """One opportunity per pair that the answering nodes agree on.
+    
+    Each node votes once per pair (its most confident entry). An action
+    wins with a strict majority of the nodes that named the pair; pairs
+    without one - e.g. one buy and one sell - are dropped. The merged
+    confidence is the winners' mean scaled by the share of all answering
+    nodes that agree, and expected_profit is the winners' median.
+    """
+    votes: Dict[str, Dict[str, Dict]] = {}  # pair -> node index -> entry
+    for node, opportunities in enumerate(answers):
+        for opp in opportunities:
+            current = votes.setdefault(opp["pair"], {}).get(node)
+            if current is None or opp["confidence"] > current["confidence"]:
+                votes[opp["pair"]][node] = opp
+                
+    merged = []
+    for pair, by_node in votes.items():
+        tally: Dict[str, List[Dict]] = {}
+        for opp in by_node.values():
+            tally.setdefault(opp["action"], []).append(opp)
+        action, agreeing = max(tally.items(), key=lambda item: len(item[1]))
+        if len(agreeing) * 2 <= len(by_node):
+            continue
+        
+        profits = sorted(opp["expected_profit"] for opp in agreeing)
+        mid = len(profits) // 2
+        best = max(agreeing, key=lambda opp: opp["confidence"])
+        opportunity = {
+            "pair": pair,
+            "action": action,
+            "confidence": sum(opp["confidence"] for opp in agreeing) / len(answers),  # Mean x agreement share
+            "expected_profit": profits[mid] if len(profits) % 2 else (profits[mid - 1] + profits[mid]) / 2,
+            "votes": len(agreeing)
+        }
+        if best.get("reason"):
+            opportunity["reason"] = f"{best['reason']} ({len(agreeing)}/{len(answers)} models)"
+        merged.append(opportunity)
+    return merged
@@ -0,0 +1,43 @@
+# startup.py - Startup phase timing, so slow restarts show where the time went
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+# Taken when the first bot module imports this one - close enough to process start
+PROCESS_START = time.perf_counter()
+
+
+class PhaseTimer:
+    def __init__(self):
+        """Wall time per named startup phase (imports, init, probes...).
+        
+        Phases may run on background threads; they show up in the report
+        once finished, flagged so their time isn't mistaken for blocking time.
+        """
+        self.lock = threading.Lock()
+        self.phases: List[Tuple[str, float, bool]] = []  # (name, seconds, background)
+        
+    @contextmanager
+    def phase(self, name: str, background: bool = False):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phases.append((name, time.perf_counter() - started, background))
+                
+    def report(self, title: str = "Startup"):
+        """Print the breakdown and the time elapsed since process start"""
+        with self.lock:
+            phases = list(self.phases)
+        
+        print(f"\n⏱️  {title} breakdown:")
+        for name, seconds, background in phases:
+            suffix = "  (background)" if background else ""
+            print(f"   {name:<28} {seconds * 1000:8.1f} ms{suffix}")
+        print(f"   {'total since start':<28} {(time.perf_counter() - PROCESS_START) * 1000:8.1f} ms")
+
+
+# Process-wide timer shared by main and the modules it sets up
+timer = PhaseTimer()
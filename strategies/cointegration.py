@@ -0,0 +1,95 @@
+# strategies/cointegration.py - Batched correlation and Engle-Granger tests
+import numpy as np
+from typing import Optional, Tuple
+
+# MacKinnon (2010) asymptotic 5% critical value for a two-variable
+# Engle-Granger test with constant
+EG_CRITICAL_5PCT = -3.34
+
+
+def correlated_pairs(values: np.ndarray, threshold: float,
+                     chunk_size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """All column pairs (i < j) of a T x N price matrix with correlation above threshold.
+    
+    The full N x N correlation matrix comes from one matrix product. With
+    `chunk_size` set, it is built in row blocks of that many assets instead,
+    so memory stays at chunk_size x N for universes of hundreds of tokens.
+    Returns (i, j, corr) index arrays.
+    """
+    centered = values - values.mean(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = centered / np.sqrt((centered * centered).sum(axis=0))
+    
+    n_assets = values.shape[1]
+    if not chunk_size or chunk_size >= n_assets:
+        corr = z.T @ z
+        i, j = np.triu_indices(n_assets, k=1)
+        c = corr[i, j]
+        mask = c > threshold
+        return i[mask], j[mask], c[mask]
+    
+    found_i, found_j, found_c = [], [], []
+    for start in range(0, n_assets, chunk_size):
+        stop = min(start + chunk_size, n_assets)
+        block = z[:, start:stop].T @ z[:, start:]
+        # Keep only the upper triangle: global column > global row
+        rows, cols = np.nonzero(block > threshold)
+        upper = cols > rows
+        rows, cols = rows[upper], cols[upper]
+        found_i.append(rows + start)
+        found_j.append(cols + start)
+        found_c.append(block[rows, cols])
+        
+    return np.concatenate(found_i), np.concatenate(found_j), np.concatenate(found_c)
+
+
+def engle_granger(values: np.ndarray, i: np.ndarray, j: np.ndarray,
+                  lags: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized Engle-Granger step for column pairs (i[k], j[k]).
+    
+    Regresses each asset i on asset j with an intercept (all pairs in one
+    batched OLS), then computes the ADF t-statistic of the residuals.
+    Returns (hedge_ratios, adf_stats); compare adf_stats to EG_CRITICAL_5PCT.
+    """
+    a = values[:, i]
+    b = values[:, j]
+    a_centered = a - a.mean(axis=0)
+    b_centered = b - b.mean(axis=0)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hedge_ratios = (a_centered * b_centered).sum(axis=0) / (b_centered * b_centered).sum(axis=0)
+        residuals = a_centered - hedge_ratios * b_centered
+        adf_stats = adf_statistic(residuals, lags)
+        
+    return hedge_ratios, adf_stats
+
+
+def adf_statistic(series: np.ndarray, lags: int = 0) -> np.ndarray:
+    """ADF t-statistic (no constant) for every column of a T x P matrix.
+    
+    Solves all P regressions of d(e_t) on e_(t-1) and `lags` lagged
+    differences with one batched solve of the normal equations.
+    """
+    diffs = np.diff(series, axis=0)
+    n_obs = diffs.shape[0] - lags
+    target = diffs[lags:].T  # P x n
+    
+    regressors = [series[lags:-1]]
+    for k in range(1, lags + 1):
+        regressors.append(diffs[lags - k:len(diffs) - k])
+    design = np.stack(regressors, axis=-1).transpose(1, 0, 2)  # P x n x k
+    
+    xtx = np.einsum("pnk,pnl->pkl", design, design)
+    xty = np.einsum("pnk,pn->pk", design, target)
+    
+    valid = np.abs(np.linalg.det(xtx)) > 0
+    xtx[~valid] = np.eye(lags + 1)  # Placeholder so the batched solve succeeds
+    
+    coef = np.linalg.solve(xtx, xty[..., None])[..., 0]
+    resid = target - np.einsum("pnk,pk->pn", design, coef)
+    sigma2 = (resid * resid).sum(axis=1) / (n_obs - (lags + 1))
+    std_err = np.sqrt(sigma2 * np.linalg.inv(xtx)[:, 0, 0])
+    
+    stats = coef[:, 0] / std_err
+    stats[~valid] = np.nan
+    return stats
@@ -0,0 +1,146 @@
+# strategies/model_store.py - Versioned on-disk store for the RF/GB ensemble
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.preprocessing import StandardScaler
+
+import config
+
+
+class ModelBundle(NamedTuple):
+    """Everything inference needs, swapped in and out as one object"""
+    scaler: StandardScaler
+    models: Dict
+    schema: str
+    window: str
+
+
+def schema_hash(features: pd.DataFrame) -> str:
+    """Identifies the feature layout (column names, order and dtypes)"""
+    layout = [(str(col), str(dtype)) for col, dtype in features.dtypes.items()]
+    return hashlib.sha1(json.dumps(layout).encode()).hexdigest()[:12]
+
+
+def window_hash(features: pd.DataFrame, signals: pd.Series) -> str:
+    """Identifies the training window - changes whenever the data moves"""
+    h = hashlib.sha1()
+    h.update(np.ascontiguousarray(features.to_numpy(dtype=float)).tobytes())
+    h.update(np.ascontiguousarray(np.asarray(signals)).tobytes())
+    h.update(pd.Index(features.index).astype(str).str.cat().encode())
+    return h.hexdigest()[:12]
+
+
+def fit_bundle(features: pd.DataFrame, signals: pd.Series, rf_jobs: Optional[int] = None) -> ModelBundle:
+    """Fit scaler + ensemble from scratch"""
+    scaler = StandardScaler()
+    X = scaler.fit_transform(features)
+    
+    # Ensemble of models
+    rf = RandomForestClassifier(n_estimators=100, max_depth=5, n_jobs=rf_jobs)
+    gb = GradientBoostingClassifier(n_estimators=100, max_depth=3)
+    
+    rf.fit(X, signals)
+    gb.fit(X, signals)
+    
+    return ModelBundle(scaler, {'rf': rf, 'gb': gb}, schema_hash(features), window_hash(features, signals))
+
+
+class ModelStore:
+    def __init__(self, root: str = config.MODEL_STORE_DIR, keep: int = 5):
+        """Models live at <root>/<pair>/v<N>-<schema>-<window>.joblib
+        
+        Each pair directory has a manifest.json listing its versions,
+        newest last. Files are written uncompressed so their arrays
+        can be memory-mapped on load.
+        """
+        self.root = root
+        self.keep = keep
+        self.lock = threading.Lock()
+        
+    def _pair_dir(self, pair: str) -> str:
+        return os.path.join(self.root, re.sub(r"[^A-Za-z0-9_.-]", "_", pair))
+    
+    def _read_manifest(self, pair: str) -> list:
+        try:
+            with open(os.path.join(self._pair_dir(pair), "manifest.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+    
+    def _write_atomic(self, path: str, write):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    
+    def save(self, pair: str, bundle: ModelBundle) -> str:
+        """Persist a bundle as the newest version for `pair`"""
+        with self.lock:
+            pair_dir = self._pair_dir(pair)
+            os.makedirs(pair_dir, exist_ok=True)
+            
+            manifest = self._read_manifest(pair)
+            version = manifest[-1]["version"] + 1 if manifest else 1
+            filename = f"v{version}-{bundle.schema}-{bundle.window}.joblib"
+            
+            self._write_atomic(
+                os.path.join(pair_dir, filename),
+                lambda f: joblib.dump(
+                    {"scaler": bundle.scaler, "models": bundle.models}, f
+                )
+            )
+            manifest.append({
+                "version": version,
+                "file": filename,
+                "schema": bundle.schema,
+                "window": bundle.window,
+                "sklearn": sklearn.__version__,
+                "created": time.time()
+            })
+            
+            # Prune old versions, manifest first so readers never see a missing file
+            expired, manifest = manifest[:-self.keep], manifest[-self.keep:]
+            self._write_atomic(
+                os.path.join(pair_dir, "manifest.json"),
+                lambda f: f.write(json.dumps(manifest, indent=2).encode())
+            )
+            for entry in expired:
+                try:
+                    os.unlink(os.path.join(pair_dir, entry["file"]))
+                except OSError:
+                    pass
+            return filename
+    
+    def load(self, pair: str, schema: str, window: Optional[str] = None) -> Optional[ModelBundle]:
+        """Newest bundle for `pair` matching `schema` (and `window` if given).
+        
+        Numpy arrays in the pickle are memory-mapped read-only where the
+        estimator keeps them as plain arrays (sklearn's tree internals copy).
+        """
+        for entry in reversed(self._read_manifest(pair)):
+            if entry["schema"] != schema or (window and entry["window"] != window):
+                continue
+            if entry.get("sklearn") != sklearn.__version__:
+                continue  # Pickles aren't portable across sklearn versions
+            try:
+                data = joblib.load(os.path.join(self._pair_dir(pair), entry["file"]), mmap_mode="r")
+            except (OSError, ValueError, EOFError) as e:
+                print(f"⚠️  Could not load model {entry['file']}: {e}")
+                continue
+            return ModelBundle(data["scaler"], data["models"], entry["schema"], entry["window"])
+        return None
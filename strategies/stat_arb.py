@@ -1,34 +1,71 @@
 # strategies/stat_arb.py
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.preprocessing import StandardScaler
-from typing import List, Dict, Tuple
-import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler
+from typing import List, Dict, Optional, Tuple
+import ta
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from instrumentation import span
+from strategies.cointegration import correlated_pairs, engle_granger, EG_CRITICAL_5PCT
+from strategies.model_store import ModelStore, fit_bundle, schema_hash, window_hash
+from strategies.streaming_features import StreamingSpreadFeatures
+from strategies.training import TrainingResult, TrainingScheduler
+
+DEFAULT_PAIR = "default"
+
+
+def make_labels(prices: pd.Series, horizon: int) -> pd.Series:
+    """1 if the price is higher `horizon` bars later, else 0"""
+    return (prices.shift(-horizon) > prices).astype(int)
 
 
 class StatisticalArbitrageStrategy:
-    def __init__(self, lookback_period=20, n_pairs=10):
+    def __init__(self, lookback_period=20, n_pairs=10, model_store: Optional[ModelStore] = None):
         self.lookback_period = lookback_period
         self.n_pairs = n_pairs
-        self.models = {}
-        self.scaler = StandardScaler()
+        self.model_store = model_store
         
-    def identify_cointegrated_pairs(self, price_data: pd.DataFrame) -> List[tuple]:
-        """Find cointegrated crypto pairs using statistical tests"""
-        # Implement cointegration test (Johansen or Engle-Granger)
-        pairs = []
-        assets = price_data.columns
+        # pair -> ModelBundle. Replaced whole, never mutated, so inference
+        # always sees a consistent scaler + ensemble even during a refit
+        self.bundles = {}
+        self.refit_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="refit")
+        self.feature_streams = {}  # pair -> StreamingSpreadFeatures
+        self.pair_stats = {}  # (asset_a, asset_b) -> corr / hedge_ratio / adf_stat
         
-        for i in range(len(assets)):
-            for j in range(i+1, len(assets)):
-                # Calculate correlation and cointegration
-                corr = price_data[assets[i]].corr(price_data[assets[j]])
-                if corr > 0.7:  # High correlation threshold
-                    pairs.append((assets[i], assets[j], corr))
+    def identify_cointegrated_pairs(self, price_data: pd.DataFrame, corr_threshold: float = 0.7,
+                                    adf_critical: float = EG_CRITICAL_5PCT, adf_lags: int = 0,
+                                    chunk_size: Optional[int] = None) -> List[tuple]:
+        """Find cointegrated crypto pairs using statistical tests
+        
+        Builds the full correlation matrix in one NumPy pass, then runs a
+        batched Engle-Granger test only on pairs above `corr_threshold`.
+        Set `chunk_size` to bound memory for universes of hundreds of tokens.
+        Rows with any missing price are dropped before testing.
+        """
+        prices = price_data.dropna()
+        assets = prices.columns
+        values = prices.to_numpy(dtype=float)
+        
+        # Correlation pre-filter - one matrix product for all N^2 pairs
+        i, j, corr = correlated_pairs(values, corr_threshold, chunk_size)
+        
+        # Engle-Granger on the survivors, in chunks to bound T x P memory
+        step = chunk_size * chunk_size if chunk_size else len(i)
+        pairs = []
+        self.pair_stats = {}
+        for start in range(0, len(i), max(step, 1)):
+            stop = start + step
+            hedge, adf = engle_granger(values, i[start:stop], j[start:stop], adf_lags)
+            for k in np.nonzero(adf < adf_critical)[0]:
+                a, b = assets[i[start + k]], assets[j[start + k]]
+                c = float(corr[start + k])
+                pairs.append((a, b, c))
+                self.pair_stats[(a, b)] = {
+                    "corr": c,
+                    "hedge_ratio": float(hedge[k]),
+                    "adf_stat": float(adf[k])
+                }
         
         return sorted(pairs, key=lambda x: x[2], reverse=True)[:self.n_pairs]
     
@@ -49,35 +86,176 @@ class StatisticalArbitrageStrategy:
         
         return features.dropna()
     
-    def train_ml_model(self, features: pd.DataFrame, signals: pd.Series):
+    def update_features(self, pair: str, price_a: float, price_b: float) -> Optional[Dict[str, float]]:
+        """Live path: O(1) feature update for one new bar of `pair`.
+        
+        Produces the same values as the last row of calculate_spread_features
+        over the full history, without recomputing it.
+        """
+        stream = self.feature_streams.get(pair)
+        if stream is None:
+            stream = self.feature_streams[pair] = StreamingSpreadFeatures()
+        with span("features.update"):
+            return stream.update(price_a, price_b)
+    
+    def warm_up_features(self, pair: str, pair_data: pd.DataFrame) -> Optional[Dict[str, float]]:
+        """Replay history once so live updates can continue from the last bar"""
+        stream = self.feature_streams[pair] = StreamingSpreadFeatures()
+        for price_a, price_b in zip(pair_data.iloc[:, 0].to_numpy(), pair_data.iloc[:, 1].to_numpy()):
+            stream.update(float(price_a), float(price_b))
+        return stream.latest
+    
+    @property
+    def models(self) -> Dict:
+        bundle = self.bundles.get(DEFAULT_PAIR)
+        return bundle.models if bundle else {}
+    
+    @property
+    def scaler(self) -> StandardScaler:
+        bundle = self.bundles.get(DEFAULT_PAIR)
+        return bundle.scaler if bundle else StandardScaler()
+    
+    def train_ml_model(self, features: pd.DataFrame, signals: pd.Series, pair: str = DEFAULT_PAIR):
         """Train ensemble ML model for signal generation"""
-        X = self.scaler.fit_transform(features)
+        bundle = fit_bundle(features, signals)
+        self.bundles[pair] = bundle
+        
+        if self.model_store:
+            self.model_store.save(pair, bundle)
+    
+    def train_pairs(self, jobs: Dict[str, Tuple[pd.DataFrame, pd.Series]],
+                    budget: Optional[float] = None, cores: Optional[int] = None) -> TrainingResult:
+        """Train every selected pair in parallel: {pair: (features, signals)}.
+        
+        Finished pairs are swapped in as they are collected; pairs that miss
+        the wall-clock `budget` or fail to fit keep their current model
+        (failures are listed in the result's `failed`).
+        """
+        bundles = TrainingScheduler(cores=cores, budget=budget).run(jobs)
+        for pair, bundle in bundles.items():
+            self.bundles[pair] = bundle
+            if self.model_store:
+                self.model_store.save(pair, bundle)
+        return bundles
+    
+    def load_or_train(self, features: pd.DataFrame, signals: pd.Series, pair: str = DEFAULT_PAIR) -> str:
+        """Warm start from the model store, training only when needed.
+        
+        - exact match for this training window: load it, no training
+        - older window with the same feature schema: serve it right away
+          and refit in the background
+        - nothing usable: train now
+        Returns which of "loaded", "stale" or "trained" happened.
+        """
+        if self.model_store:
+            schema = schema_hash(features)
+            bundle = self.model_store.load(pair, schema, window_hash(features, signals))
+            if bundle:
+                self.bundles[pair] = bundle
+                return "loaded"
+            
+            bundle = self.model_store.load(pair, schema)
+            if bundle:
+                self.bundles[pair] = bundle
+                self.refit_in_background(features, signals, pair)
+                return "stale"
         
-        # Ensemble of models
-        rf = RandomForestClassifier(n_estimators=100, max_depth=5)
-        gb = GradientBoostingClassifier(n_estimators=100, max_depth=3)
+        self.train_ml_model(features, signals, pair)
+        return "trained"
+    
+    def warm_start(self, price_data: pd.DataFrame, horizon: int = 5, min_bars: int = 200) -> Dict[str, str]:
+        """Startup path: pick pairs from stored history and load or fit a model for each.
         
-        rf.fit(X, signals)
-        gb.fit(X, signals)
+        Each pair's history is also replayed into its live feature stream.
+        Pairs with fewer than `min_bars` labelled rows are skipped. Returns
+        {pair: "loaded" | "stale" | "trained"}.
+        """
+        if price_data.empty:
+            return {}
         
-        self.models = {'rf': rf, 'gb': gb}
+        statuses = {}
+        for a, b, _ in self.identify_cointegrated_pairs(price_data):
+            pair = f"{a}/{b}"
+            pair_data = price_data[[a, b]].dropna()
+            features = self.calculate_spread_features(pair_data)
+            if len(features) - horizon < min_bars:
+                continue
+            labels = make_labels(pair_data[a], horizon).loc[features.index]
+            try:
+                # The last `horizon` labels look past the end of history
+                statuses[pair] = self.load_or_train(features.iloc[:-horizon], labels.iloc[:-horizon], pair)
+            except Exception as e:
+                print(f"❌ Model for {pair} failed: {str(e)}")
+                continue
+            self.warm_up_features(pair, pair_data)
+        return statuses
+    
+    def refit_in_background(self, features: pd.DataFrame, signals: pd.Series,
+                            pair: str = DEFAULT_PAIR) -> Future:
+        """Retrain off the hot path; the new bundle is swapped in atomically when done"""
+        return self.refit_executor.submit(self.train_ml_model, features, signals, pair)
     
     def generate_signals(self, current_features: pd.DataFrame) -> Dict:
         """Generate trading signals using ML ensemble"""
-        X = self.scaler.transform(current_features)
-        
-        # Ensemble prediction
-        rf_pred = self.models['rf'].predict_proba(X)[0]
-        gb_pred = self.models['gb'].predict_proba(X)[0]
+        return self.generate_signals_batch(current_features.iloc[:1])[0]
+    
+    def generate_signals_batch(self, feature_rows: pd.DataFrame, pairs: Optional[List[str]] = None,
+                               threshold: float = 0.9) -> List[Dict]:
+        """Score every active pair at once: one scale pass and one predict pass per model.
         
-        # Weighted average (can be optimized)
-        ensemble_prob = 0.6 * rf_pred + 0.4 * gb_pred
+        `feature_rows` holds one row per pair (e.g. the latest row of each
+        pair's features). Rows are scored with their pair's model, falling
+        back to the default model; rows with neither get neutral
+        probabilities, i.e. hold. Returns one signal dict per row, in order.
+        """
+        with span("inference"):
+            ensemble_prob = self._ensemble_proba(feature_rows, pairs)
         
         # Generate signal only if high confidence (>90th percentile)
-        if ensemble_prob[1] > 0.9:  # Buy signal
-            return {"action": "buy", "confidence": ensemble_prob[1]}
-        elif ensemble_prob[0] > 0.9:  # Sell signal
-            return {"action": "sell", "confidence": ensemble_prob[0]}
-        else:
-            return {"action": "hold", "confidence": max(ensemble_prob)}
-    
\ No newline at end of file
+        buy = ensemble_prob[:, 1] > threshold
+        sell = ~buy & (ensemble_prob[:, 0] > threshold)
+        actions = np.where(buy, "buy", np.where(sell, "sell", "hold"))
+        confidence = np.where(buy, ensemble_prob[:, 1],
+                              np.where(sell, ensemble_prob[:, 0], ensemble_prob.max(axis=1)))
+        
+        if pairs is None:
+            pairs = [None] * len(actions)
+        signals = []
+        for pair, action, conf in zip(pairs, actions.tolist(), confidence.tolist()):
+            signal = {"action": action, "confidence": conf}
+            if pair is not None:
+                signal["pair"] = pair
+            signals.append(signal)
+        return signals
+    
+    def _ensemble_proba(self, feature_rows: pd.DataFrame, pairs: Optional[List[str]]) -> np.ndarray:
+        """Ensemble class probabilities, one batched pass per distinct model.
+        
+        Rows whose pair has no model and no default model to fall back on
+        are left uniform across classes, so they never clear the threshold.
+        """
+        # Group rows by the bundle that scores them (read once - refits may swap it)
+        bundles = self.bundles
+        groups = {}
+        for row, pair in enumerate(pairs or [DEFAULT_PAIR] * len(feature_rows)):
+            bundle = bundles.get(pair) or bundles.get(DEFAULT_PAIR)
+            if bundle is not None:
+                groups.setdefault(id(bundle), (bundle, []))[1].append(row)
+        
+        if not groups:
+            return np.full((len(feature_rows), 2), 0.5)
+        
+        ensemble_prob = None
+        for bundle, rows in groups.values():
+            X = bundle.scaler.transform(feature_rows.iloc[rows])
+            
+            # Ensemble prediction
+            rf_pred = bundle.models['rf'].predict_proba(X)
+            gb_pred = bundle.models['gb'].predict_proba(X)
+            
+            if ensemble_prob is None:
+                ensemble_prob = np.full((len(feature_rows), rf_pred.shape[1]), 1 / rf_pred.shape[1])
+            # Weighted average (can be optimized)
+            ensemble_prob[rows] = 0.6 * rf_pred + 0.4 * gb_pred
+            
+        return ensemble_prob
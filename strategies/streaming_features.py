@@ -0,0 +1,136 @@
+# strategies/streaming_features.py
+import math
+from collections import deque
+from typing import Dict, Optional
+
+
+class RollingStats:
+    """Mean and sample std over the last `window` values, O(1) per update.
+    
+    Uses Welford's add/remove updates (the same scheme pandas' rolling
+    var uses), so results match `Series.rolling(window)` to float rounding.
+    """
+    
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        
+    def update(self, x: float):
+        if len(self.values) == self.window:
+            self._remove(self.values.popleft())
+        self.values.append(x)
+        
+        n = len(self.values)
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+        
+    def _remove(self, x: float):
+        n = len(self.values)  # Already popped
+        if n == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = x - self.mean
+        self.mean -= delta / n
+        self.m2 -= delta * (x - self.mean)
+        
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window
+    
+    @property
+    def std(self) -> float:
+        n = len(self.values)
+        if n < 2:
+            return math.nan
+        return math.sqrt(max(self.m2, 0.0) / (n - 1))
+
+
+class WilderRSI:
+    """Streaming RSI matching ta.momentum.RSIIndicator (EWM, alpha=1/window, adjust=False)"""
+    
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.alpha = 1.0 / window
+        self.prev = None
+        self.avg_up = 0.0
+        self.avg_down = 0.0
+        self.count = 0
+        
+    def update(self, price: float) -> float:
+        # ta treats the undefined first diff as a zero move
+        diff = 0.0 if self.prev is None else price - self.prev
+        self.prev = price
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        
+        if self.count == 0:
+            self.avg_up, self.avg_down = up, down
+        else:
+            self.avg_up = (1 - self.alpha) * self.avg_up + self.alpha * up
+            self.avg_down = (1 - self.alpha) * self.avg_down + self.alpha * down
+        self.count += 1
+        
+        if self.count < self.window:
+            return math.nan
+        if self.avg_down == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_up / self.avg_down)
+
+
+class StreamingSpreadFeatures:
+    """Incremental version of StatisticalArbitrageStrategy.calculate_spread_features.
+    
+    Feed one (price_a, price_b) bar at a time. Each update is O(1) and
+    returns the same feature row the batch path would produce for that bar,
+    or None while the row would still be dropped by dropna().
+    """
+    
+    COLUMNS = ["spread", "spread_ma", "spread_std", "z_score", "rsi_1", "rsi_2", "volume_ratio"]
+    
+    def __init__(self, spread_window: int = 20, rsi_window: int = 14, volume_window: int = 10):
+        self.spread = RollingStats(spread_window)
+        self.rsi_1 = WilderRSI(rsi_window)
+        self.rsi_2 = WilderRSI(rsi_window)
+        self.volume_1 = RollingStats(volume_window)
+        self.volume_2 = RollingStats(volume_window)
+        self.latest = None
+        
+    def update(self, price_a: float, price_b: float) -> Optional[Dict[str, float]]:
+        spread = price_a - price_b
+        self.spread.update(spread)
+        self.volume_1.update(price_a)
+        self.volume_2.update(price_b)
+        rsi_1 = self.rsi_1.update(price_a)
+        rsi_2 = self.rsi_2.update(price_b)
+        
+        if not (self.spread.ready and self.volume_1.ready) or math.isnan(rsi_1) or math.isnan(rsi_2):
+            return None
+        
+        spread_ma = self.spread.mean
+        spread_std = self.spread.std
+        z_score = _divide(spread - spread_ma, spread_std)
+        volume_ratio = _divide(self.volume_1.mean, self.volume_2.mean)
+        if math.isnan(z_score) or math.isnan(volume_ratio):
+            return None
+        
+        self.latest = {
+            "spread": spread,
+            "spread_ma": spread_ma,
+            "spread_std": spread_std,
+            "z_score": z_score,
+            "rsi_1": rsi_1,
+            "rsi_2": rsi_2,
+            "volume_ratio": volume_ratio
+        }
+        return self.latest
+
+
+def _divide(a: float, b: float) -> float:
+    """Float division with pandas semantics (x/0 -> +-inf, 0/0 -> nan)"""
+    if b == 0:
+        return math.nan if a == 0 else math.copysign(math.inf, a)
+    return a / b
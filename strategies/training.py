@@ -0,0 +1,90 @@
+# strategies/training.py - Parallel per-pair training across cores
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from strategies.model_store import ModelBundle, fit_bundle
+
+# progress(pair, done, total, seconds)
+ProgressFn = Callable[[str, int, int, float], None]
+
+
+def plan_shards(n_pairs: int, cores: Optional[int] = None) -> Tuple[int, int]:
+    """Split cores between pairs (processes) and trees (RF n_jobs per process).
+    
+    10 pairs on 16 cores -> 10 processes x 1 job; 2 pairs -> 2 x 8.
+    """
+    cores = cores or os.cpu_count() or 1
+    workers = max(1, min(n_pairs, cores))
+    return workers, max(1, cores // workers)
+
+
+def _train_pair(pair: str, features: pd.DataFrame, signals: pd.Series, rf_jobs: int):
+    """Runs in a worker process"""
+    started = time.monotonic()
+    bundle = fit_bundle(features, signals, rf_jobs=rf_jobs)
+    return pair, bundle, time.monotonic() - started
+
+
+class TrainingResult(Dict[str, ModelBundle]):
+    """{pair: ModelBundle} for the pairs that trained, plus `failed`: {pair: error}"""
+    def __init__(self):
+        super().__init__()
+        self.failed: Dict[str, str] = {}
+
+
+def print_progress(pair: str, done: int, total: int, seconds: float):
+    print(f"🧠 Trained {pair} ({done}/{total}) in {seconds:.1f}s")
+
+
+class TrainingScheduler:
+    def __init__(self, cores: Optional[int] = None, budget: Optional[float] = None,
+                 progress: Optional[ProgressFn] = print_progress):
+        """Fits every pair's ensemble in a process pool.
+        
+        `budget` is a wall-clock limit in seconds for the whole run. Pairs
+        not finished by then are left out of the result (and keep their
+        previous model); fits already running finish in the background. A
+        pair whose fit raises is logged, listed in the result's `failed`,
+        and doesn't stop the others from being collected.
+        """
+        self.cores = cores or os.cpu_count() or 1
+        self.budget = budget
+        self.progress = progress
+        
+    def run(self, jobs: Dict[str, Tuple[pd.DataFrame, pd.Series]]) -> TrainingResult:
+        results = TrainingResult()
+        if not jobs:
+            return results
+        
+        workers, rf_jobs = plan_shards(len(jobs), self.cores)
+        started = time.monotonic()
+        
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                executor.submit(_train_pair, pair, features, signals, rf_jobs): pair
+                for pair, (features, signals) in jobs.items()
+            }
+            for future in as_completed(futures, timeout=self.budget):
+                try:
+                    pair, bundle, seconds = future.result()
+                except Exception as e:
+                    pair = futures[future]
+                    results.failed[pair] = str(e)
+                    print(f"❌ Training {pair} failed: {str(e)}")
+                    continue
+                results[pair] = bundle
+                if self.progress:
+                    self.progress(pair, len(results) + len(results.failed), len(jobs), seconds)
+        except TimeoutError:
+            missing = [pair for pair in jobs if pair not in results and pair not in results.failed]
+            print(f"⏱️  Training budget of {self.budget}s hit after "
+                  f"{time.monotonic() - started:.1f}s - skipped {', '.join(missing)}")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+        return results
@@ -0,0 +1,130 @@
+# token_registry.py - Symbol <-> address resolution for every supported chain, built once
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from eth_utils import to_checksum_address
+
+import config
+
+# Decimals for the Ethereum tokens in config.TOKENS (addresses come from there)
+ETH_DECIMALS = {"USDC": 6, "WETH": 18, "WBTC": 8, "LINK": 18, "USDT": 6, "UNI": 18, "AAVE": 18}
+
+# chain -> symbol -> (address, decimals). Ethereum extends config.TOKENS;
+# other chains list the canonical (native or official bridge) deployments.
+CHAIN_TOKENS: Dict[str, Dict[str, Tuple[str, int]]] = {
+    "eth": {
+        **{symbol: (address, ETH_DECIMALS[symbol]) for symbol, address in config.TOKENS.items()},
+        "PEPE": ("0x6982508145454Ce325dDbE47a25d4ec3d2311933", 18),
+        "SHIB": ("0x95aD61b0a150d79219dCF64E1E6Cc01f0B64C4cE", 18)
+    },
+    "polygon": {
+        "USDC": ("0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359", 6),
+        "WETH": ("0x7ceB23fD6bC0adD59E62ac25578270cFf1b9f619", 18),
+        "WBTC": ("0x1BFD67037B42Cf73acF2047067bd4F2C47D9BfD6", 8),
+        "USDT": ("0xc2132D05D31c914a87C6611C10748AEb04B58e8F", 6)
+    },
+    "bsc": {
+        "USDC": ("0x8AC76a51cc950d9822D68b83fE1Ad97B32Cd580d", 18),
+        "WETH": ("0x2170Ed0880ac9A755fd29B2688956BD959F933F8", 18),
+        "USDT": ("0x55d398326f99059fF775485246999027B3197955", 18)
+    },
+    "arbitrum": {
+        "USDC": ("0xaf88d065e77c8cC2239327C5EDb3A432268e5831", 6),
+        "WETH": ("0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", 18),
+        "WBTC": ("0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f", 8),
+        "USDT": ("0xFd086bC7CD5C481DCC9C85ebE478A1C0b69FCbb9", 6)
+    },
+    "base": {
+        "USDC": ("0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913", 6),
+        "WETH": ("0x4200000000000000000000000000000000000006", 18)
+    },
+    "optimism": {
+        "USDC": ("0x0b2C639c533813f4Aa9D7837CAf62653d097Ff85", 6),
+        "WETH": ("0x4200000000000000000000000000000000000006", 18),
+        "WBTC": ("0x68f180fcCe6836688e9084f035309E29Bf0A2095", 8),
+        "USDT": ("0x94b008aA00579c1307B0EF2c499aD98a8ce58e58", 6)
+    },
+    "avalanche": {
+        "USDC": ("0xB97EF9Ef8734C71904D8002F8b6Bc66Dd9c48a6E", 6),
+        "WETH": ("0x49D5c2BdFfac6CE2BFdB6640F4F80f226bc10bAB", 18),
+        "USDT": ("0x9702230A8Ea53601f5cD2dc00fDBc13d4dF4A8c7", 6)
+    },
+    "linea": {
+        "USDC": ("0x176211869cA2b568f2A7D4EE941E073a821EE1ff", 6),
+        "WETH": ("0xe5D7C2a44FfDDf6b295A15c148167daaAf5Cf34f", 18)
+    }
+}
+
+# USD stablecoins - valued at $1 and never arbitraged against each other
+STABLECOINS = frozenset(["USDC", "USDT", "DAI"])
+
+# Symbols we know about but can't trade as ERC-20s - rejected with a reason, never sent raw
+UNRESOLVABLE = {
+    "DOGE": "DOGE is not an ERC-20; there is no canonical contract to trade on EVM chains"
+}
+
+
+class Token(NamedTuple):
+    chain: str
+    symbol: str
+    address: str     # EIP-55 checksum form
+    decimals: int
+
+
+class UnknownTokenError(ValueError):
+    pass
+
+
+class TokenRegistry:
+    def __init__(self, tables: Dict[str, Dict[str, Tuple[str, int]]] = CHAIN_TOKENS):
+        """Every (chain, symbol) and (chain, address) resolved up front.
+        
+        Addresses are checksummed once here and indexed in both checksum and
+        lowercase form, and all strings are interned, so resolving a token
+        on the order path is a single dict lookup either way.
+        """
+        self.by_symbol: Dict[Tuple[str, str], Token] = {}
+        self.by_address: Dict[Tuple[str, str], Token] = {}
+        self.symbols: Dict[str, str] = {}  # Any-chain address -> symbol
+        self.chains: Dict[str, List[Token]] = {}
+        
+        for chain, tokens in tables.items():
+            if chain not in config.SUPPORTED_CHAINS:
+                raise ValueError(f"Unsupported chain in token table: {chain}")
+            chain = sys.intern(chain)
+            for symbol, (address, decimals) in tokens.items():
+                token = Token(chain, sys.intern(symbol), sys.intern(to_checksum_address(address)), decimals)
+                self.by_symbol[(chain, token.symbol)] = token
+                for form in (token.address, sys.intern(token.address.lower())):
+                    self.by_address[(chain, form)] = token
+                    self.symbols.setdefault(form, token.symbol)
+                self.chains.setdefault(chain, []).append(token)
+                
+    def get(self, token: str, chain: str = "eth") -> Optional[Token]:
+        """Token by symbol or address, or None"""
+        found = self.by_symbol.get((chain, token)) or self.by_address.get((chain, token))
+        if found is None:
+            # Slow path for odd casing ("usdc", all-caps hex) - not taken for normal input
+            found = self.by_symbol.get((chain, token.upper())) or self.by_address.get((chain, token.lower()))
+        return found
+    
+    def resolve(self, token: str, chain: str = "eth") -> Token:
+        found = self.get(token, chain)
+        if found is None:
+            reason = UNRESOLVABLE.get(token.upper(), f"no address for {token} on {chain}")
+            raise UnknownTokenError(reason)
+        return found
+    
+    def address(self, token: str, chain: str = "eth") -> str:
+        return self.resolve(token, chain).address
+    
+    def symbol(self, token: str) -> str:
+        """Symbol for an address on any chain; symbols and unknown input pass through"""
+        return self.symbols.get(token) or self.symbols.get(token.lower(), token)
+    
+    def tokens(self, chain: str = "eth") -> List[Token]:
+        return list(self.chains.get(chain, ()))
+
+
+# Built once at import; shared by the engine, the gate, the cache and the backtester
+registry = TokenRegistry()
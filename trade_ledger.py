@@ -0,0 +1,231 @@
+# trade_ledger.py - Bounded in-memory trade ledger with an append-only segment log
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterator, Optional, Tuple
+
+import config
+from token_registry import STABLECOINS, registry
+
+
+class CostBasis:
+    def __init__(self):
+        """Average-cost book per non-stable token: symbol -> (amount held, USD cost)"""
+        self.positions: Dict[str, Tuple[float, float]] = {}
+        
+    def realize(self, from_token: str, to_token: str, amount, raw: Optional[Dict] = None) -> float:
+        """Apply one fill and return its realized PnL in USD.
+        
+        The fill's USD value comes from tradeAmountUsd, or from the stable
+        leg's amount. Selling a token realizes proceeds minus the average
+        cost of the amount sold; the bought token's basis grows by the USD
+        value. Fills we can't value realize nothing and leave the book as is.
+        """
+        tx = (raw or {}).get("transaction", raw or {})
+        from_symbol, to_symbol = registry.symbol(from_token), registry.symbol(to_token)
+        from_amount = float(tx.get("fromAmount", amount))
+        to_amount = float(tx["toAmount"]) if tx.get("toAmount") is not None else None
+        
+        if to_symbol in STABLECOINS and to_amount is not None:
+            value = to_amount  # What actually landed, after fees
+        elif from_symbol in STABLECOINS:
+            value = from_amount
+        else:
+            value = tx.get("tradeAmountUsd")
+        if value is None or from_amount <= 0:
+            return 0.0
+        value = float(value)
+        
+        pnl = 0.0
+        if from_symbol not in STABLECOINS:
+            held, cost = self.positions.get(from_symbol, (0.0, 0.0))
+            if held > 0:
+                sold = min(from_amount, held)
+                basis = cost * sold / held
+                pnl = value * sold / from_amount - basis
+                self.positions[from_symbol] = (held - sold, cost - basis)
+        if to_symbol not in STABLECOINS and to_amount:
+            held, cost = self.positions.get(to_symbol, (0.0, 0.0))
+            self.positions[to_symbol] = (held + to_amount, cost + value)
+        return pnl
+
+
+class TradeRecord:
+    """One trade, without the raw API response (that lives in the segment log)"""
+    __slots__ = ("ts", "from_token", "to_token", "amount", "reason", "pnl", "segment", "offset")
+    
+    def __init__(self, ts: float, from_token: str, to_token: str, amount: float, reason: str,
+                 pnl: float, segment: int = -1, offset: int = -1):
+        self.ts = ts
+        self.from_token = from_token
+        self.to_token = to_token
+        self.amount = amount
+        self.reason = reason
+        self.pnl = pnl
+        self.segment = segment
+        self.offset = offset
+        
+    def as_dict(self) -> Dict:
+        return {
+            "timestamp": self.ts,
+            "from": self.from_token,
+            "to": self.to_token,
+            "amount": self.amount,
+            "reason": self.reason,
+            "pnl": self.pnl
+        }
+
+
+class TradeLedger:
+    def __init__(self, capacity: int = config.LEDGER_CAPACITY, log_dir: Optional[str] = config.LEDGER_DIR,
+                 segment_bytes: int = config.LEDGER_SEGMENT_BYTES, start_balance: Optional[float] = None):
+        """Ring buffer of the last `capacity` trades plus running aggregates.
+        
+        Every trade (with its raw API response) is also appended to
+        <log_dir>/trades-NNNNNN.jsonl, rolling to a new segment after
+        `segment_bytes`. Pass log_dir=None to keep nothing on disk.
+        """
+        self.recent = deque(maxlen=capacity)
+        self.log_dir = log_dir
+        self.segment_bytes = segment_bytes
+        self.start_balance = start_balance
+        self.lock = threading.Lock()
+        
+        # Running aggregates - stats never scan the history
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.total_pnl = 0.0
+        self.peak_pnl = 0.0
+        self.max_drawdown_usd = 0.0
+        self.max_drawdown = 0.0  # Fraction of peak equity, needs start_balance
+        
+        # Average cost per token - record() realizes each fill's PnL against it
+        self.cost_basis = CostBasis()
+        
+        self.segment = 0
+        self.log = None
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+            existing = [name for name in os.listdir(log_dir) if name.startswith("trades-")]
+            self.segment = max((int(name[7:13]) for name in existing), default=0)
+            self._replay(sorted(existing))
+            self._open_segment()
+            
+    def _replay(self, segments):
+        """Restore aggregates, cost basis and the ring buffer after a restart (one scan at startup)"""
+        for name in segments:
+            segment = int(name[7:13])
+            path = os.path.join(self.log_dir, name)
+            with open(path, "rb") as f:
+                offset = 0
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("unterminated line")
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Torn final line from a crash
+                    record = TradeRecord(
+                        entry["timestamp"], sys.intern(entry["from"]), sys.intern(entry["to"]),
+                        entry["amount"], entry["reason"], entry["pnl"], segment, offset
+                    )
+                    self.recent.append(record)
+                    self._update_aggregates(record.pnl)
+                    self.cost_basis.realize(entry["from"], entry["to"], entry["amount"], entry.get("raw"))
+                    offset += len(line)
+                    
+            # Cut a torn tail off so new records start on a clean line
+            if os.path.getsize(path) > offset:
+                with open(path, "r+b") as f:
+                    f.truncate(offset)
+    
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.log_dir, f"trades-{segment:06d}.jsonl")
+    
+    def _open_segment(self):
+        if self.log:
+            self.log.close()
+        self.log = open(self._segment_path(self.segment), "ab")
+        
+    def record(self, from_token: str, to_token: str, amount, reason: str,
+               raw: Optional[Dict] = None, pnl: Optional[float] = None, ts: Optional[float] = None) -> TradeRecord:
+        """Add a trade; `pnl` is its realized profit in USD.
+        
+        Left as None, the fill is applied to the cost basis and its realized
+        PnL computed there - under the ledger lock, in the same order as the
+        log, so concurrent fills and replay agree.
+        """
+        with self.lock:
+            if pnl is None:
+                pnl = self.cost_basis.realize(from_token, to_token, amount, raw)
+            record = TradeRecord(
+                ts if ts is not None else time.time(),
+                sys.intern(from_token),
+                sys.intern(to_token),
+                float(amount),
+                reason,
+                float(pnl)
+            )
+            
+            if self.log:
+                if self.log.tell() >= self.segment_bytes:
+                    self.segment += 1
+                    self._open_segment()
+                record.segment, record.offset = self.segment, self.log.tell()
+                line = dict(record.as_dict(), raw=raw)
+                self.log.write(json.dumps(line, separators=(",", ":"), default=str).encode() + b"\n")
+                self.log.flush()
+            
+            self.recent.append(record)
+            self._update_aggregates(record.pnl)
+            
+        return record
+    
+    def _update_aggregates(self, pnl: float):
+        self.total_trades += 1
+        if pnl > 0:
+            self.winning_trades += 1
+        elif pnl < 0:
+            self.losing_trades += 1
+        self.total_pnl += pnl
+        self.peak_pnl = max(self.peak_pnl, self.total_pnl)
+        self.max_drawdown_usd = max(self.max_drawdown_usd, self.peak_pnl - self.total_pnl)
+        if self.start_balance:
+            peak_equity = self.start_balance + self.peak_pnl
+            if peak_equity > 0:
+                drawdown = (self.peak_pnl - self.total_pnl) / peak_equity
+                self.max_drawdown = max(self.max_drawdown, drawdown)
+        
+    def raw(self, record: TradeRecord) -> Optional[Dict]:
+        """Raw API response for a trade, read back from its segment"""
+        if record.segment < 0:
+            return None
+        with open(self._segment_path(record.segment), "rb") as f:
+            f.seek(record.offset)
+            return json.loads(f.readline())["raw"]
+    
+    def stats(self) -> Dict:
+        return {
+            "total_trades": self.total_trades,
+            "winning_trades": self.winning_trades,
+            "losing_trades": self.losing_trades,
+            "total_pnl": self.total_pnl,
+            "max_drawdown_usd": self.max_drawdown_usd,
+            "max_drawdown": self.max_drawdown
+        }
+    
+    def __iter__(self) -> Iterator[TradeRecord]:
+        return iter(list(self.recent))
+    
+    def __len__(self) -> int:
+        return len(self.recent)
+    
+    def close(self):
+        with self.lock:
+            if self.log:
+                self.log.close()
+                self.log = None
@@ -1,12 +1,16 @@
 # trading_engine.py - COMPETITION READY VERSION
 import requests
 import json
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import time
 from datetime import datetime
+import config
+from token_registry import UnknownTokenError, registry
+from trade_ledger import TradeLedger
+from transport import get_transport
 
 class TradingEngine:
-    def __init__(self, api_key: str, base_url: str):
+    def __init__(self, api_key: str, base_url: str, ledger: Optional[TradeLedger] = None):
         self.api_key = api_key
         self.base_url = base_url
         self.headers = {
@@ -14,22 +18,28 @@ class TradingEngine:
             "Content-Type": "application/json"
         }
         
-        # Track performance for competition
-        self.competition_stats = {
-            "trades": [],
-            "total_pnl": 0,
-            "start_balance": None
-        }
+        # Keep-alive pooled connections - no TCP/TLS handshake per order
+        self.http = get_transport()
+        
+        # Track performance for competition - bounded memory, full history on disk
+        self.ledger = ledger if ledger is not None else TradeLedger()
+        
+        # Called with each successful trade record (portfolio cache, stats...)
+        self.trade_listeners: List[Callable[[Dict], None]] = []
         
-    def execute_trade(self, from_token: str, to_token: str, amount: str, reason: str) -> Dict:
+    def execute_trade(self, from_token: str, to_token: str, amount: str, reason: str,
+                      chain: str = "eth") -> Dict:
         """Execute trade - NO GAS COSTS in competition!"""
         endpoint = f"{self.base_url}/api/trade/execute"
         
-        # IMPORTANT: Use token addresses, not symbols!
-        if from_token in ["USDC", "WETH", "WBTC"]:
-            from_token = config.TOKENS.get(from_token, from_token)
-        if to_token in ["USDC", "WETH", "WBTC"]:
-            to_token = config.TOKENS.get(to_token, to_token)
+        # IMPORTANT: Use token addresses, not symbols! Unknown tokens are
+        # refused here rather than sent to the API as raw symbols
+        try:
+            from_token = registry.address(from_token, chain)
+            to_token = registry.address(to_token, chain)
+        except UnknownTokenError as e:
+            print(f"❌ Trade refused: {str(e)}")
+            return {"success": False, "error": str(e), "status": 400}
             
         payload = {
             "fromToken": from_token,
@@ -37,10 +47,13 @@ class TradingEngine:
             "amount": amount,
             "reason": reason
         }
+        if chain != "eth":
+            # Mainnet is the API default; other EVM chains must be named
+            payload.update(fromChain="evm", toChain="evm", fromSpecificChain=chain, toSpecificChain=chain)
         
         try:
             print(f"🔄 Executing: {amount} {from_token[:8]}... → {to_token[:8]}...")
-            response = requests.post(
+            response = self.http.post(
                 endpoint, 
                 json=payload, 
                 headers=self.headers, 
@@ -50,14 +63,16 @@ class TradingEngine:
             if response.ok:
                 result = response.json()
                 
-                # Track for competition
-                self.competition_stats["trades"].append({
+                # Track for competition, with the fill's realized PnL
+                record = self.ledger.record(from_token, to_token, amount, reason, raw=result)
+                self._notify_trade({
                     "timestamp": datetime.now().isoformat(),
                     "from": from_token,
                     "to": to_token,
                     "amount": amount,
                     "result": result,
-                    "reason": reason
+                    "reason": reason,
+                    "pnl": record.pnl
                 })
                 
                 print(f"✅ Trade successful!")
@@ -73,12 +88,29 @@ class TradingEngine:
             print(f"❌ Exception: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    @property
+    def competition_stats(self) -> Dict:
+        """Summary view of the ledger: recent trades plus running totals"""
+        return {
+            "trades": [record.as_dict() for record in self.ledger],
+            "total_pnl": self.ledger.total_pnl,
+            "start_balance": self.ledger.start_balance,
+            **self.ledger.stats()
+        }
+    
+    def _notify_trade(self, trade: Dict):
+        for listener in self.trade_listeners:
+            try:
+                listener(trade)
+            except Exception as e:
+                print(f"⚠️  Trade listener failed: {str(e)}")
+    
     def get_portfolio(self) -> Dict:
         """Get portfolio - handle empty responses"""
         endpoint = f"{self.base_url}/api/portfolio"
         
         try:
-            response = requests.get(endpoint, headers=self.headers, timeout=10)
+            response = self.http.get(endpoint, headers=self.headers, timeout=10)
             
             if response.ok:
                 data = response.json()
@@ -106,11 +138,6 @@ class TradingEngine:
     def get_supported_tokens(self, chain: str = "eth") -> List[str]:
         """Get supported tokens for a chain"""
         # From Discord: Can trade almost any token including memecoins
-        # For competition, focus on major pairs for liquidity
-        major_tokens = list(config.TOKENS.keys())
-        
-        # Add some profitable memecoins if you want
-        if chain in ["eth", "base"]:
-            major_tokens.extend(["PEPE", "SHIB", "DOGE"])
-            
-        return major_tokens
\ No newline at end of file
+        # For competition, focus on major pairs for liquidity. Only tokens
+        # with a known address on `chain` are listed (memecoins included on eth)
+        return [token.symbol for token in registry.tokens(chain)]
\ No newline at end of file
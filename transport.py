@@ -0,0 +1,99 @@
+# transport.py - Shared keep-alive HTTP transport
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+from instrumentation import metrics
+
+# Methods that are safe to replay after the server has seen the request.
+# POSTs (trades!) are only retried when the connection failed before sending.
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+
+class HTTPTransport:
+    def __init__(self, pool_hosts: int = config.HTTP_POOL_HOSTS,
+                 pool_maxsize: int = config.HTTP_POOL_MAXSIZE,
+                 retries: int = config.HTTP_RETRIES,
+                 backoff: float = config.HTTP_BACKOFF):
+        """Persistent session with a bounded connection pool per host"""
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=IDEMPOTENT_METHODS,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_hosts,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,  # Wait for a free connection instead of opening extras
+            max_retries=retry
+        )
+        
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Async calls share the same pool via a bounded thread pool
+        self.executor = ThreadPoolExecutor(max_workers=pool_maxsize, thread_name_prefix="http")
+        
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        if not metrics.enabled:
+            return self.session.request(method, url, **kwargs)
+        
+        # Per-endpoint latency; timeouts/errors counted by the span, 5xx/429 here
+        parts = urlsplit(url)
+        endpoint = f"{method.upper()} {parts.netloc}{parts.path}"
+        with metrics.span(endpoint, family="http"):
+            response = self.session.request(method, url, **kwargs)
+        if response.status_code >= 500 or response.status_code == 429:
+            metrics.increment("failures", endpoint)
+        return response
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+    
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+    
+    async def arequest(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Async variant for the bot's event loop - never blocks the loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, partial(self.request, method, url, **kwargs)
+        )
+    
+    async def aget(self, url: str, **kwargs) -> requests.Response:
+        return await self.arequest("GET", url, **kwargs)
+    
+    async def apost(self, url: str, **kwargs) -> requests.Response:
+        return await self.arequest("POST", url, **kwargs)
+    
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+
+_transport: Optional[HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """Process-wide transport shared by TradingEngine and GAIANode"""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HTTPTransport()
+    return _transport